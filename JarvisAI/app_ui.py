@@ -1,11 +1,15 @@
 import sys
 import datetime
 import config
+import phrases
 import commands
+import router
 import voice
+import speech
+import file_index
+import http_client
 import os
 import time
-import pyttsx3
 from queue import Empty
 
 from PyQt6.QtWidgets import (
@@ -15,31 +19,6 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import QThread, pyqtSignal, QObject, Qt, QByteArray, QBuffer, QIODevice
 from PyQt6.QtGui import QMovie, QFont
-import requests
-
-
-class TTSWorker(QThread):
-    def run(self):
-        local_engine = pyttsx3.init()
-        local_engine.setProperty('rate', config.VOICE_RATE)
-
-        try:
-            local_engine.setProperty('voice', config.VOICE_ID)
-        except:
-            pass
-
-        while True:
-            try:
-                text = voice.speech_queue.get()
-
-                if text is None:
-                    break
-
-                local_engine.say(text)
-                local_engine.runAndWait()
-
-            except Exception as e:
-                print(f"TTS Error: {e}")
 
 
 class ListenerWorker(QObject):
@@ -47,7 +26,7 @@ class ListenerWorker(QObject):
     query_signal = pyqtSignal(str)
 
     def run(self):
-        query = voice.listen()
+        query = voice.listen(on_partial=router.speculate)
         self.query_signal.emit(query)
         self.finished.emit()
 
@@ -64,134 +43,15 @@ class AssistantWorker(QObject):
         query = self.query_text
 
         try:
-            if "exit" in query or "bye" in query or "stop listening" in query:
-                voice.say("Goodbye Parth, closing the assistant.")
+            if router.dispatch(query) == "exit":
+                voice.say(phrases.GOODBYE_UI)
                 time.sleep(1.0)
                 self.app_instance.quit()
-                return
-
-            elif query.startswith(("open ", "launch ")):
-                content = query.replace("open ", "", 1).replace("launch ", "", 1).strip()
-                is_website_command = any(term in query for term in ["website", "site", "go to", "url"]) or any(
-                    suffix in content for suffix in [".com", ".org", ".net", ".edu", ".gov"])
-
-                if is_website_command:
-                    site = content
-                    if "go to" in query:
-                        site = query.split("go to")[-1].strip()
-                    site = site.replace("website", "").replace("site", "").replace("go to", "").strip()
-
-                    if site.lower().strip() in ("any kind of site", ""):
-                        site = "google.com"
-                        voice.say("I'll open Google for you.")
-
-                    if site:
-                        commands.open_website(site)
-                    else:
-                        voice.say("Which website should I open?")
-                else:
-                    commands.open_app(content)
-
-            elif "shutdown" in query:
-                commands.shutdown()
-            elif "restart" in query:
-                commands.restart()
-
-            elif any(phrase in query for phrase in
-                     ["run diagnostics", "check system", "check memory", "check battery", "system status"]):
-                commands.run_diagnostics()
-
-            elif any(phrase in query for phrase in ["forget that", "forget about", "delete my fact"]):
-                commands.forget_fact(query)
-
-            elif any(phrase in query for phrase in
-                     ["remember that", "save this fact", "my name is", "i am called", "i live in"]):
-                commands.remember_fact(query)
-
-            elif any(phrase in query for phrase in
-                     ["what is my", "what is your favorite", "where is my", "tell me about my"]):
-                commands.recall_fact(query)
-
-            elif any(phrase in query for phrase in ["set volume to", "change volume to", "volume up", "volume down"]):
-                commands.set_system_volume(query)
-
-            elif any(phrase in query for phrase in ["delete file", "remove file", "trash file"]):
-                commands.delete_file(query)
-
-            elif any(phrase in query for phrase in ["create note", "make a note", "write down", "journal that"]):
-                commands.create_note(query)
-
-            elif "convert" in query or "conversion" in query:
-                commands.convert_units(query)
-
-            elif any(phrase in query for phrase in
-                     ["what's copied", "read clipboard", "process clipboard", "what did i copy"]):
-                commands.process_clipboard()
-
-            elif query.startswith(("search file for", "find file for", "search local for")):
-                keyword = query.split("for")[-1].strip()
-                if keyword:
-                    commands.search_local_files(keyword)
-                else:
-                    voice.say("Please provide a keyword to search for.")
-
-            elif any(phrase in query for phrase in
-                     ["plan a trip", "book a flight", "find a hotel", "trip to", "commute"]):
-                commands.plan_trip_search(query)
-
-            elif any(phrase in query for phrase in ["directions to", "map of", "show me on map", "where is"]):
-                commands.search_maps(query)
-
-            elif any(phrase in query for phrase in ["search youtube", "find on youtube", "play on youtube"]):
-                commands.search_youtube(query)
-
-            elif "time" in query:
-                commands.get_time()
-            elif "date" in query or "today's date" in query:
-                commands.get_date()
-            elif "weather" in query or "temperature" in query:
-                parts = query.split("in")
-                city = parts[-1].strip() if len(parts) > 1 else ""
-                if city:
-                    commands.get_weather(city)
-                else:
-                    voice.say("Which city would you like the weather for?")
-            elif "news" in query or "headlines" in query:
-                commands.get_news()
-            elif "wikipedia" in query or "tell me about" in query:
-                term = query.split("wikipedia")[-1].split("tell me about")[-1].strip()
-                if term:
-                    commands.search_wikipedia(term)
-                else:
-                    voice.say("What would you like me to search on Wikipedia?")
-            elif "tell me a joke" in query or "joke" in query:
-                commands.tell_a_joke()
-            elif any(word in query for word in
-                     ["plus", "minus", "times", "divide", "+", "-", "*", "/", "^", "square", "root", "sin", "cos",
-                      "tan", "calculate"]):
-                expr = query.replace("what is", "").replace("calculate", "").replace("?", "").strip()
-                commands.perform_calculation(expr)
-
-            elif "add to do" in query or "add task" in query:
-                task = query.split("add to do")[-1].split("add task")[-1].strip()
-                if task:
-                    commands.add_todo(task)
-                else:
-                    voice.say("What task would you like to add?")
-            elif "view to do" in query or "what are my tasks" in query:
-                commands.view_todo()
-            elif "clear to do" in query:
-                commands.clear_todo()
-            elif "music" in query or "spotify" in query or "play" in query:
-                commands.play_music()
-
-            else:
-                commands.search_web_general(query)
 
         except Exception as e:
             if voice.log_to_ui_callback:
                 voice.log_to_ui_callback(f"<b><font color='red'>An unexpected error occurred: {e}</font></b>", "red")
-            voice.say("I encountered an internal error while processing that command.")
+            voice.say(phrases.INTERNAL_ERROR, voice.URGENT)
             print(f"Error during command processing: {e}")
 
         finally:
@@ -258,9 +118,10 @@ class AssistantWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.set_status("Ready. Click Listen to Command.")
 
-
-        self.tts_worker = TTSWorker()
-        self.tts_worker.start()
+        speech.get_service().start()
+        file_index.get_index()
+        commands.start_prefetch()
+        commands.start_monitor()
 
     def set_status(self, text, color='#A0A0A0'):
         self.status_bar.setStyleSheet(
@@ -340,7 +201,7 @@ class AssistantWindow(QMainWindow):
 
     def load_gif_from_url(self, url, movie_player):
         try:
-            response = requests.get(url, stream=True, timeout=10)
+            response = http_client.get(url, timeout=10)
             if response.status_code == 200:
                 self.gif_byte_array = QByteArray(response.content)
                 self.gif_buffer = QBuffer(self.gif_byte_array)
@@ -357,6 +218,6 @@ if __name__ == '__main__':
     window = AssistantWindow()
     window.show()
     voice.set_ui_log_callback(window.append_log)
-    app.aboutToQuit.connect(voice.engine.stop)
+    app.aboutToQuit.connect(speech.get_service().stop)
     window.app = app
     sys.exit(app.exec())
\ No newline at end of file
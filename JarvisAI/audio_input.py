@@ -0,0 +1,252 @@
+"""Long-lived microphone capture for voice.listen().
+
+The input stream is opened once and read continuously by a background
+thread. While nobody is listening, the thread keeps the voice-activity
+detector's noise floor calibrated to the room and fills a short pre-roll ring
+buffer, so listen() starts instantly and the first word is not clipped.
+Utterances are endpointed by vad.Endpointer as soon as speech stops.
+"""
+import atexit
+import collections
+import math
+import threading
+import time
+from queue import Queue, Empty, Full
+
+import speech_recognition as sr
+
+import config
+from vad import VoiceActivityDetector, Endpointer
+
+
+class MicrophoneSession:
+    """Keeps one microphone stream open and hands out phrases from it."""
+
+    def __init__(self, chunk_size=1024, preroll_seconds=config.MIC_PREROLL_SECONDS,
+                 calibration_seconds=config.MIC_CALIBRATION_SECONDS):
+        self.chunk_size = chunk_size
+        self.preroll_seconds = preroll_seconds
+        self.calibration_seconds = calibration_seconds
+
+        self.detector = None
+        self.last_endpoint_delay = None
+
+        self.microphone = None
+        self.source = None
+        self.sample_rate = None
+        self.sample_width = None
+        self.seconds_per_chunk = None
+
+        self._preroll = None
+        self._frames = Queue(maxsize=2000)
+        self._listening = False
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Opens the input stream, runs the initial calibration and starts the reader thread."""
+        if self._running:
+            return
+        self.microphone = sr.Microphone(chunk_size=self.chunk_size)
+        self.source = self.microphone.__enter__()
+        self.sample_rate = self.source.SAMPLE_RATE
+        self.sample_width = self.source.SAMPLE_WIDTH
+        self.seconds_per_chunk = float(self.source.CHUNK) / self.sample_rate
+        self.detector = VoiceActivityDetector(self.sample_rate)
+        self._preroll = collections.deque(maxlen=max(1, int(math.ceil(self.preroll_seconds / self.seconds_per_chunk))))
+
+        self._calibrate(self.calibration_seconds)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._read_loop, name="MicrophoneSession", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Stops the reader thread and closes the input stream."""
+        if not self._running:
+            return
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        try:
+            self.microphone.__exit__(None, None, None)
+        except Exception as e:
+            print(f"Microphone close error: {e}")
+        self.source = None
+
+    def _read_chunk(self):
+        return self.source.stream.read(self.source.CHUNK)
+
+    def _calibrate(self, duration):
+        """Seeds the noise floor from a short sample of room noise, like adjust_for_ambient_noise."""
+        elapsed = 0.0
+        while elapsed < duration:
+            buffer = self._read_chunk()
+            elapsed += self.seconds_per_chunk
+            self.detector.update_noise(buffer)
+            self._preroll.append(buffer)
+
+    def _read_loop(self):
+        failures = 0
+        while self._running:
+            try:
+                buffer = self._read_chunk()
+            except Exception as e:
+                failures += 1
+                if failures >= config.MIC_MAX_READ_ERRORS:
+                    # The device is most likely gone; the next listen() reopens it.
+                    print(f"Microphone read error: {e}. Giving up after {failures} failures in a row.")
+                    self.stop()
+                    return
+                print(f"Microphone read error: {e}")
+                time.sleep(min(config.MIC_READ_BACKOFF_MAX, 0.05 * 2 ** failures))
+                continue
+            failures = 0
+
+            with self._lock:
+                if self._listening:
+                    try:
+                        self._frames.put_nowait(buffer)
+                    except Full:
+                        pass
+                else:
+                    # Only track the room while idle so the user's own voice doesn't raise the bar.
+                    self.detector.update_noise(buffer)
+                    self._preroll.append(buffer)
+
+    def listen(self, timeout=config.LISTEN_TIMEOUT, phrase_time_limit=config.PHRASE_TIME_LIMIT, on_chunk=None,
+               busy=None, on_barge_in=None):
+        """Returns the next phrase as sr.AudioData, or None if no speech starts within timeout.
+
+        on_chunk, if given, receives every chunk of the phrase as it is captured so a
+        streaming recognizer can work while the user is still speaking.
+
+        busy, if given, returns True while the assistant itself is talking. Audio heard then
+        only counts as speech when it is BARGE_IN_RATIO louder than the echo of that playback,
+        and on_barge_in is called as soon as it does, so the assistant can fall silent.
+        """
+        if not self._running:
+            self.start()
+
+        with self._lock:
+            recent = collections.deque(self._preroll, maxlen=self._preroll.maxlen)
+            self._drain()
+            self._listening = True
+
+        try:
+            frames = self._wait_for_speech(recent, timeout, busy, on_barge_in)
+            if frames is None:
+                return None
+            self._collect_phrase(frames, phrase_time_limit, on_chunk)
+        finally:
+            with self._lock:
+                self._listening = False
+                self._drain()
+
+        return sr.AudioData(b"".join(frames), self.sample_rate, self.sample_width)
+
+    def chunks(self):
+        """Yields live chunks until the generator is closed; used by the wake-word spotter."""
+        if not self._running:
+            self.start()
+
+        with self._lock:
+            self._drain()
+            self._listening = True
+        try:
+            while True:
+                if not self._running:
+                    self.start()  # the reader gave up on a failing device; reopen it
+                try:
+                    buffer = self._next_chunk()
+                except Empty:
+                    continue
+                self._preroll.append(buffer)
+                yield buffer
+        finally:
+            with self._lock:
+                self._listening = False
+                self._drain()
+            # The pre-roll now ends with the wake word itself; keep it out of the command.
+            self._preroll.clear()
+
+    def _drain(self):
+        while True:
+            try:
+                self._frames.get_nowait()
+            except Empty:
+                return
+
+    def _next_chunk(self):
+        return self._frames.get(timeout=max(1.0, self.seconds_per_chunk * 4))
+
+    def _wait_for_speech(self, recent, timeout, busy=None, on_barge_in=None):
+        """Blocks until the detector hears speech; returns the pre-roll plus the triggering chunk."""
+        # Whatever the microphone picked up just before listening is the best guess at the playback echo.
+        echo = [max([self.detector.level(buffer) for buffer in recent], default=0.0)]
+
+        def heard(buffer):
+            if busy is None or not busy():
+                return self.detector.is_speech(buffer)
+            # The assistant is talking: only a voice well above its own echo is the user barging in.
+            if self.detector.is_speech(buffer, floor=echo[0] * config.BARGE_IN_RATIO):
+                if on_barge_in:
+                    on_barge_in()
+                return True
+            echo[0] = max(echo[0] * 0.9, self.detector.level(buffer))
+            return False
+
+        # Speech may already have started in the pre-roll if the user spoke right after the prompt.
+        if busy is None or not busy():
+            if any(self.detector.is_speech(buffer) for buffer in recent):
+                return list(recent)
+
+        elapsed = 0.0
+        while timeout is None or elapsed < timeout:
+            try:
+                buffer = self._next_chunk()
+            except Empty:
+                return None
+            elapsed += self.seconds_per_chunk
+            recent.append(buffer)
+            if heard(buffer):
+                return list(recent)
+        return None
+
+    def _collect_phrase(self, frames, phrase_time_limit, on_chunk=None):
+        """Appends chunks to frames until the endpointer hears the end of speech or the time limit hits."""
+        endpointer = Endpointer(self.detector)
+        for buffer in frames:
+            endpointer.feed(buffer)
+            if on_chunk:
+                on_chunk(buffer)
+
+        phrase_seconds = 0.0
+        while phrase_time_limit is None or phrase_seconds < phrase_time_limit:
+            try:
+                buffer = self._next_chunk()
+            except Empty:
+                break
+            frames.append(buffer)
+            phrase_seconds += self.seconds_per_chunk
+            if on_chunk:
+                on_chunk(buffer)
+            if endpointer.feed(buffer):
+                break
+        self.last_endpoint_delay = endpointer.endpoint_delay
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Returns the shared, already-calibrated microphone session, opening it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = MicrophoneSession()
+            _session.start()
+        return _session
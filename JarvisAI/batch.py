@@ -0,0 +1,95 @@
+"""Headless batch/replay entry point.
+
+Feeds text queries through the same router the CLI and UI use, without a
+microphone, and prints throughput and per-command timings.
+
+Usage:
+    python batch.py session.txt             # one query per line
+    python batch.py corpus.jsonl            # {"query": ...} per line
+    cat queries.txt | python batch.py --dry-run --echo
+"""
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+
+import router
+from dryrun import DryRun
+from benchmarks.bench_commands import percentile
+
+
+def read_queries(stream, jsonl=False):
+    """Yields non-empty queries from a text or JSONL stream."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        if jsonl:
+            entry = json.loads(line)
+            line = entry.get("query", "") if isinstance(entry, dict) else str(entry)
+        if line:
+            yield line
+
+
+def run_batch(queries, repeat=1):
+    """Dispatches every query and returns (per-intent timings in ms, errors, elapsed seconds)."""
+    timings = defaultdict(list)
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            try:
+                intent = router.dispatch(query)
+            except Exception as e:
+                intent = "error"
+                errors += 1
+                print(f"Error while processing '{query}': {e}")
+            timings[intent].append((time.perf_counter() - start) * 1000)
+    return timings, errors, time.perf_counter() - started
+
+
+def print_summary(timings, errors, elapsed, dry_run=None):
+    total = sum(len(samples) for samples in timings.values())
+    print("\n--- Batch Summary ---")
+    print(f"{total} queries in {elapsed:.3f}s ({total / elapsed if elapsed else 0:.1f} queries/s), {errors} errors")
+    print(f"{'intent':<16}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for intent, samples in sorted(timings.items(), key=lambda item: -len(item[1])):
+        print(f"{intent:<16}{len(samples):>8}{sum(samples) / len(samples):>10.3f}"
+              f"{percentile(samples, 50):>10.3f}{percentile(samples, 99):>10.3f}")
+    if dry_run is not None:
+        kinds = sorted({kind for _, kind, _ in dry_run.events})
+        print("Recorded side effects: " + (", ".join(f"{kind}={dry_run.count(kind)}" for kind in kinds) or "none"))
+    print("---------------------")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay text queries through the Jarvis command pipeline.")
+    parser.add_argument("source", nargs="?", default="-", help="Text or JSONL file of queries ('-' for stdin).")
+    parser.add_argument("--jsonl", action="store_true", help="Treat the input as JSONL even without a .jsonl name.")
+    parser.add_argument("--dry-run", action="store_true", help="Record speech, browser, app and shutdown calls.")
+    parser.add_argument("--echo", action="store_true", help="Print recorded side effects as they happen.")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the whole input this many times.")
+    args = parser.parse_args(argv)
+
+    jsonl = args.jsonl or args.source.endswith(".jsonl")
+    if args.source == "-":
+        queries = list(read_queries(sys.stdin, jsonl))
+    else:
+        with open(args.source, "r") as f:
+            queries = list(read_queries(f, jsonl))
+
+    if args.dry_run:
+        with DryRun(echo=args.echo) as dry_run:
+            timings, errors, elapsed = run_batch(queries, args.repeat)
+    else:
+        dry_run = None
+        timings, errors, elapsed = run_batch(queries, args.repeat)
+
+    print_summary(timings, errors, elapsed, dry_run)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
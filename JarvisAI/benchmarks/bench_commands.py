@@ -0,0 +1,250 @@
+"""Microbenchmarks for the text -> action hot path.
+
+Runs the utterance corpus through the router and the pure-CPU commands with
+every side effect (speech, browser, subprocesses, network, clipboard) stubbed
+out through the dry-run layer, and reports per-intent p50/p99 latency and
+peak allocation.
+
+Usage (from the JarvisAI directory):
+    python -m benchmarks.bench_commands
+    python -m benchmarks.bench_commands --save-baseline
+    python -m benchmarks.bench_commands --compare
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+import commands
+import http_client
+import journal
+import memory_store
+import prefetch
+import response_cache
+import router
+import todo_store
+from dryrun import DryRun, patched
+from journal import Journal
+from memory_store import MemoryStore
+from prefetch import Refresher
+from response_cache import ResponseCache
+from todo_store import TodoStore
+from benchmarks.corpus import build_corpus, load_corpus, save_corpus
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+COMMAND_CASES = {
+    "convert_units": (commands.convert_units, [
+        "convert 25 celsius to fahrenheit", "convert 10 miles to kilometers", "convert 70 kg to lbs",
+        "convert 98.6 fahrenheit to celsius", "convert five apples"]),
+    "perform_calculation": (commands.perform_calculation, [
+        "12 plus 30", "2 ^ 10", "144 divided by 12", "sqrt(16) times 3", "sin(0.5) + cos(0.5)", "7 minus 10",
+        "square root of sixteen times three", "two to the power of ten", "sine of 0 to 90 step 15",
+        "sum of 1 to a thousand"]),
+    "remember_fact": (commands.remember_fact, [
+        "remember that my favorite color is blue", "remember that my car is a tesla",
+        "save this fact my hometown is new delhi", "remember my name"]),
+    "recall_fact": (commands.recall_fact, [
+        "what is my favorite color", "what is my car", "where is my hometown?", "tell me about my dog"]),
+    "plan_trip_search": (commands.plan_trip_search, [
+        "plan a trip to goa on friday under 20000", "book a flight to london next week with a budget of 50000",
+        "find a hotel", "trip to tokyo for two"]),
+}
+
+
+class _FakeResponse:
+    status_code = 200
+    content = b""
+
+    def json(self):
+        return {}
+
+
+@contextlib.contextmanager
+def stubbed_side_effects():
+    """Records speech, browser and process calls and stubs the network, memory and file commands."""
+    noop = lambda *args, **kwargs: None
+    with tempfile.TemporaryDirectory() as scratch, contextlib.ExitStack() as stack:
+        stack.enter_context(DryRun())
+        stack.enter_context(patched(http_client, "get", lambda *args, **kwargs: _FakeResponse()))
+        stack.enter_context(patched(commands.wikipedia, "summary", lambda *args, **kwargs: "Stub. Summary."))
+        stack.enter_context(patched(commands.pyperclip, "paste", lambda: "clipboard text"))
+        stack.enter_context(patched(commands.time, "sleep", noop))
+        stack.enter_context(patched(memory_store, "_store", MemoryStore(os.path.join(scratch, "memory.json"))))
+        stack.enter_context(patched(commands, "search_local_files", noop))
+        stack.enter_context(patched(commands, "search_file_contents", noop))
+        stack.enter_context(patched(commands, "run_diagnostics", noop))
+        stack.enter_context(patched(commands, "diagnostics_report", lambda: "Diagnostics stub."))
+        stack.enter_context(patched(response_cache, "_cache", ResponseCache(os.path.join(scratch, "cache.db"))))
+        stack.enter_context(patched(prefetch, "_refresher", Refresher(state_path=None)))
+        stack.enter_context(patched(journal, "_journal", Journal(os.path.join(scratch, "notes.txt"))))
+        stack.enter_context(patched(todo_store, "_store", TodoStore(os.path.join(scratch, "todo.db"), None)))
+        yield
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _call(func, arg):
+    """Calls func(arg) and reports whether it raised, the way AssistantWorker would swallow it."""
+    try:
+        func(arg)
+        return False
+    except Exception:
+        return True
+
+
+def measure(func, arg, repeat):
+    """Returns (latencies in microseconds, peak allocated bytes, raised) for func(arg)."""
+    timings = []
+    raised = False
+    for _ in range(repeat):
+        start = time.perf_counter()
+        raised = _call(func, arg) or raised
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    tracemalloc.start()
+    tracemalloc.clear_traces()
+    _call(func, arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return timings, peak, raised
+
+
+class Samples:
+    """Latency and allocation samples collected for one intent or command."""
+
+    def __init__(self):
+        self.timings = []
+        self.peaks = []
+        self.errors = 0
+
+    def add(self, measurement):
+        timings, peak, raised = measurement
+        self.timings.extend(timings)
+        self.peaks.append(peak)
+        self.errors += raised
+
+    def summary(self):
+        return {
+            "n": len(self.timings),
+            "errors": self.errors,
+            "p50_us": round(percentile(self.timings, 50), 2),
+            "p99_us": round(percentile(self.timings, 99), 2),
+            "peak_alloc_bytes": int(sum(self.peaks) / len(self.peaks)),
+        }
+
+
+def _summarize(groups):
+    return {name: samples.summary() for name, samples in sorted(groups.items())}
+
+
+def run_suite(corpus, repeat=5):
+    """Runs every section of the benchmark and returns {section: {name: stats}}."""
+    classify = router.classify.__wrapped__
+    route_groups = defaultdict(Samples)
+    dispatch_groups = defaultdict(Samples)
+    command_groups = defaultdict(Samples)
+    misroutes = 0
+
+    with stubbed_side_effects():
+        for entry in corpus:
+            query = router.normalize(entry["query"])
+            intent = classify(query)
+            if entry.get("expected") and entry["expected"] != intent:
+                misroutes += 1
+
+            route_groups[intent].add(measure(classify, query, repeat))
+
+            if intent == "exit":
+                continue
+            dispatch_groups[intent].add(measure(router.dispatch, entry["query"], 1))
+
+        for name, (func, inputs) in COMMAND_CASES.items():
+            for arg in inputs:
+                command_groups[name].add(measure(func, arg, repeat * 20))
+
+    return {
+        "route": _summarize(route_groups),
+        "dispatch": _summarize(dispatch_groups),
+        "commands": _summarize(command_groups),
+        "meta": {"corpus_size": len(corpus), "misroutes": misroutes, "python": sys.version.split()[0]},
+    }
+
+
+def print_report(results, baseline=None):
+    for section in ("route", "dispatch", "commands"):
+        print(f"\n== {section} ==")
+        print(f"{'name':<20}{'n':>8}{'errors':>8}{'p50 us':>12}{'p99 us':>12}{'alloc B':>12}{'p99 vs base':>14}")
+        for name, stats in results[section].items():
+            delta = ""
+            base = (baseline or {}).get(section, {}).get(name)
+            if base and base["p99_us"]:
+                delta = f"{(stats['p99_us'] / base['p99_us'] - 1) * 100:+.1f}%"
+            print(f"{name:<20}{stats['n']:>8}{stats['errors']:>8}{stats['p50_us']:>12}{stats['p99_us']:>12}"
+                  f"{stats['peak_alloc_bytes']:>12}{delta:>14}")
+    print(f"\nCorpus: {results['meta']['corpus_size']} utterances, {results['meta']['misroutes']} verbatim misroutes.")
+
+
+def find_regressions(results, baseline, threshold):
+    """Lists (section, name, ratio) where p99 grew by more than threshold over the baseline."""
+    regressions = []
+    for section in ("route", "dispatch", "commands"):
+        for name, stats in results[section].items():
+            base = baseline.get(section, {}).get(name)
+            if base and base["p99_us"] and stats["p99_us"] > base["p99_us"] * (1 + threshold):
+                regressions.append((section, name, stats["p99_us"] / base["p99_us"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the router and pure-CPU commands.")
+    parser.add_argument("--corpus", help="JSONL corpus to load instead of the generated one.")
+    parser.add_argument("--size", type=int, default=5000, help="Size of the generated corpus.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per utterance.")
+    parser.add_argument("--dump-corpus", help="Write the generated corpus to this JSONL file and exit.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--compare", action="store_true", help="Fail if p99 regresses against the baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p99 growth for --compare.")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_corpus(args.size)
+    if args.dump_corpus:
+        save_corpus(args.dump_corpus, corpus)
+        print(f"Wrote {len(corpus)} utterances to {args.dump_corpus}")
+        return 0
+
+    baseline = None
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r") as f:
+            baseline = json.load(f)
+
+    results = run_suite(corpus, args.repeat)
+    print_report(results, baseline)
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline saved to {BASELINE_FILE}")
+
+    if args.compare:
+        if baseline is None:
+            print("No baseline found; run with --save-baseline first.")
+            return 1
+        regressions = find_regressions(results, baseline, args.threshold)
+        for section, name, ratio in regressions:
+            print(f"REGRESSION: {section}/{name} p99 is {ratio:.2f}x the baseline")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
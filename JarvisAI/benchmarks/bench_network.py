@@ -0,0 +1,152 @@
+"""Benchmarks for the network-backed commands against the API stand-in.
+
+Runs get_weather, get_news, tell_a_joke and search_wikipedia with
+HTTP_BACKEND set to "standin", a scratch response cache and a fresh prefetch
+refresher, so no API keys or network are needed and every run sees the same
+seeded latencies and injected errors. Reports cold (uncached) and warm
+latency per command, the wall time of concurrent fetches and of the daily
+briefing, and the HTTP, stand-in and cache counters.
+
+Usage (from the JarvisAI directory):
+    python -m benchmarks.bench_network
+    python -m benchmarks.bench_network --latency-ms 200 --error-rate 0.2 --payload-bytes 50000
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import commands
+import config
+import http_client
+import http_standin
+import prefetch
+import response_cache
+import todo_store
+from dryrun import DryRun, patched
+from http_standin import StandinServer
+from prefetch import Refresher
+from response_cache import ResponseCache
+from todo_store import TodoStore
+from benchmarks.bench_commands import percentile
+
+CITIES = ["Delhi", "Mumbai", "Paris", "Tokyo", "Lima", "Oslo", "Cairo", "Perth"]
+TOPICS = ["python", "jupiter", "mount everest", "photosynthesis", "the moon", "alan turing"]
+
+CASES = {
+    "get_weather": (commands.get_weather, CITIES),
+    "get_news": (lambda arg: commands.get_news(), [None]),
+    "tell_a_joke": (lambda arg: commands.tell_a_joke(), [None] * 4),
+    "search_wikipedia": (commands.search_wikipedia, TOPICS),
+}
+
+
+@contextlib.contextmanager
+def standin_environment(server):
+    """Points the network commands at server with scratch caches and recorded speech."""
+    noop = lambda *args, **kwargs: None
+    with tempfile.TemporaryDirectory() as scratch, contextlib.ExitStack() as stack:
+        dry_run = stack.enter_context(DryRun())
+        stack.enter_context(patched(config, "HTTP_BACKEND", "standin"))
+        stack.enter_context(patched(config, "WEATHER_API_KEY", config.WEATHER_API_KEY or "standin"))
+        stack.enter_context(patched(config, "NEWS_API_KEY", config.NEWS_API_KEY or "standin"))
+        stack.enter_context(patched(config, "PREFETCH_ENABLED", False))
+        stack.enter_context(patched(http_standin, "_server", server))
+        stack.enter_context(patched(http_client, "_metrics", defaultdict(http_client._metrics.default_factory)))
+        stack.enter_context(patched(response_cache, "_cache", ResponseCache(os.path.join(scratch, "cache.db"))))
+        stack.enter_context(patched(prefetch, "_refresher", Refresher(state_path=None)))
+        stack.enter_context(patched(todo_store, "_store", TodoStore(os.path.join(scratch, "todo.db"), None)))
+        stack.enter_context(patched(commands.time, "sleep", noop))
+        yield dry_run
+
+
+def timed(func, arg):
+    start = time.perf_counter()
+    func(arg)
+    return (time.perf_counter() - start) * 1000
+
+
+def run_suite(server, repeat=5, workers=4):
+    """Returns {"commands": {name: stats}, "concurrency": {...}, "counters": {...}}."""
+    results = {"commands": {}, "concurrency": {}}
+    with standin_environment(server) as dry_run:
+        for name, (func, args) in CASES.items():
+            cold = [timed(func, arg) for arg in args]
+            warm = [timed(func, arg) for _ in range(repeat) for arg in args]
+            results["commands"][name] = {
+                "cold_p50_ms": round(percentile(cold, 50), 2), "cold_max_ms": round(max(cold), 2),
+                "warm_p50_ms": round(percentile(warm, 50), 2), "warm_max_ms": round(max(warm), 2),
+            }
+
+        cities = [f"{city} {i}" for i, city in enumerate(CITIES)]
+        sequential = sum(timed(commands.request_weather, city) for city in cities)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            start = time.perf_counter()
+            list(executor.map(commands.request_weather, cities))
+            concurrent = (time.perf_counter() - start) * 1000
+        results["concurrency"]["weather_sequential_ms"] = round(sequential, 2)
+        results["concurrency"][f"weather_{workers}_workers_ms"] = round(concurrent, 2)
+
+        response_cache.get_cache().invalidate("weather", config.DEFAULT_CITY.lower())
+        prefetch._refresher = Refresher(state_path=None)
+        results["concurrency"]["briefing_ms"] = round(timed(lambda arg: commands.daily_briefing(), None), 2)
+
+        results["counters"] = {
+            "http": http_client.stats(),
+            "standin": dict(server.counts),
+            "cache": response_cache.get_cache().stats(),
+            "apologies": sum(1 for _, kind, text in dry_run.events
+                             if kind == "say" and ("couldn't" in text.lower() or "sorry" in text.lower())),
+        }
+    return results
+
+
+def print_report(results):
+    print("\n== commands (ms) ==")
+    print(f"{'name':<20}{'cold p50':>10}{'cold max':>10}{'warm p50':>10}{'warm max':>10}")
+    for name, stats in results["commands"].items():
+        print(f"{name:<20}{stats['cold_p50_ms']:>10}{stats['cold_max_ms']:>10}"
+              f"{stats['warm_p50_ms']:>10}{stats['warm_max_ms']:>10}")
+    print("\n== concurrency (ms) ==")
+    for name, value in results["concurrency"].items():
+        print(f"{name:<28}{value:>10}")
+    counters = results["counters"]
+    print("\n== http ==")
+    for host, entry in sorted(counters["http"].items()):
+        print(f"{host:<28}{entry['requests']:>6} requests{entry['errors']:>4} errors"
+              f"  mean {entry['mean_ms']:.1f} ms  max {entry['max_ms']:.1f} ms")
+    print(f"\nStand-in: {counters['standin']}")
+    cache = counters["cache"]
+    print(f"Cache: {cache['memory_hits']} memory hits, {cache['disk_hits']} disk hits, {cache['misses']} misses, "
+          f"{cache['served_after_error']} served after errors")
+    print(f"Apologies spoken: {counters['apologies']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the network commands against the API stand-in.")
+    parser.add_argument("--latency-ms", type=float, default=config.HTTP_STANDIN_LATENCY_MS)
+    parser.add_argument("--jitter-ms", type=float, default=config.HTTP_STANDIN_JITTER_MS)
+    parser.add_argument("--error-rate", type=float, default=config.HTTP_STANDIN_ERROR_RATE)
+    parser.add_argument("--payload-bytes", type=int, default=config.HTTP_STANDIN_PAYLOAD_BYTES)
+    parser.add_argument("--seed", type=int, default=config.HTTP_STANDIN_SEED)
+    parser.add_argument("--repeat", type=int, default=5, help="Warm repetitions per input.")
+    parser.add_argument("--workers", type=int, default=4, help="Threads for the concurrent fetch.")
+    parser.add_argument("--cassettes", help="Cassette directory to serve (default: an empty one).")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as empty:
+        server = StandinServer(0, args.latency_ms, args.jitter_ms, args.error_rate, args.payload_bytes, args.seed,
+                               args.cassettes or empty).start()
+        try:
+            print_report(run_suite(server, args.repeat, args.workers))
+        finally:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Synthetic utterance corpus for the router and command benchmarks.
+
+Built deterministically from the router's own trigger phrases so new intents
+are covered automatically, plus misrecognitions and long clipboard-style text.
+"""
+import json
+import random
+
+import router
+
+SUBJECTS = ["paris", "the eiffel tower", "python programming", "black holes", "new delhi", "mount everest",
+            "quantum computing", "the roman empire", "my car", "favorite color", "the moon"]
+CITIES = ["delhi", "mumbai", "london", "new york", "tokyo", "berlin", "san francisco"]
+APPS = ["chrome", "spotify", "calculator", "notes", "terminal", "visual studio code", "app"]
+SITES = ["google.com", "github.com", "website wikipedia.org", "go to youtube.com", "any kind of site"]
+TASKS = ["buy milk", "call mom at five", "finish the quarterly report", "book dentist appointment"]
+
+TEMPLATES = {
+    "exit": ["{phrase}", "okay {phrase} for now", "{phrase} jarvis"],
+    "open": ["{phrase}{app}", "{phrase}{site}"],
+    "file_search": ["{phrase} {subject}", "{phrase} invoice 2023"],
+    "convert": ["convert 25 celsius to fahrenheit", "{phrase} 10 miles to kilometers",
+                "convert 70 kilograms to pounds", "{phrase} 98.6 fahrenheit to celsius", "convert five apples"],
+    "weather": ["what's the {phrase} in {city}", "{phrase} in {city} today", "how is the {phrase}"],
+    "wikipedia": ["{phrase} {subject}", "search {phrase} for {subject}"],
+    "remember_fact": ["remember that my favorite color is blue", "{phrase} parth", "remember that my car is a tesla",
+                      "save this fact my hometown is new delhi"],
+    "recall_fact": ["{phrase} favorite color", "{phrase} car", "{phrase} hometown?"],
+    "trip": ["{phrase} goa on friday under 20000", "plan a trip to {city} next week with a budget of 50000",
+             "{phrase} {city}"],
+    "add_todo": ["{phrase} {task}"],
+    "calculation": ["what is 12 plus 30", "calculate 2 ^ 10", "what is 144 divided by 12", "sqrt(16) times 3",
+                    "sin(0.5) + cos(0.5)", "what is 7 minus 10"],
+}
+
+MISRECOGNITIONS = ["whether in delhi", "what's the wear in london", "open crome", "tell me a jug", "what time's it",
+                   "remember dat my name is parth", "set volume to fifty", "news paper", "delete file called",
+                   "uh", "", "play", "jarvis can you", "what is the date in the wiki"]
+
+FILLERS = ["please", "jarvis", "hey", "can you", "could you", "um", "quickly", "now"]
+
+
+def _render(intent, phrase, rng):
+    templates = TEMPLATES.get(intent, ["{phrase}", "{filler} {phrase}", "{phrase} {filler}"])
+    template = rng.choice(templates)
+    return template.format(
+        phrase=phrase,
+        subject=rng.choice(SUBJECTS),
+        city=rng.choice(CITIES),
+        app=rng.choice(APPS),
+        site=rng.choice(SITES),
+        task=rng.choice(TASKS),
+        filler=rng.choice(FILLERS),
+    ).strip()
+
+
+def _garble(text, rng):
+    """Imitates recognizer noise: dropped words, swapped letters and stray fillers."""
+    words = text.split()
+    if len(words) > 2 and rng.random() < 0.3:
+        del words[rng.randrange(len(words))]
+    if words and rng.random() < 0.3:
+        index = rng.randrange(len(words))
+        word = words[index]
+        if len(word) > 3:
+            pos = rng.randrange(len(word) - 1)
+            words[index] = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(FILLERS))
+    return " ".join(words)
+
+
+def _clipboard_text(rng):
+    words = [rng.choice(SUBJECTS + CITIES + TASKS + FILLERS) for _ in range(rng.randint(40, 400))]
+    return " ".join(words)
+
+
+def build_corpus(size=5000, seed=1234):
+    """Returns a list of {"query", "expected"} dicts; expected is None for noisy or long utterances."""
+    rng = random.Random(seed)
+    triggers = [(name, getattr(phrase, "example", str(phrase))) for name, phrases, _ in router.INTENTS
+                for phrase in phrases]
+    corpus = []
+
+    # Every trigger phrase at least once, verbatim.
+    for name, phrase in triggers:
+        query = phrase + "notes" if phrase.endswith(" ") else phrase
+        corpus.append({"query": query, "expected": name})
+
+    while len(corpus) < size:
+        roll = rng.random()
+        if roll < 0.7:
+            name, phrase = rng.choice(triggers)
+            corpus.append({"query": _render(name, phrase, rng), "expected": None})
+        elif roll < 0.85:
+            name, phrase = rng.choice(triggers)
+            corpus.append({"query": _garble(_render(name, phrase, rng), rng), "expected": None})
+        elif roll < 0.95:
+            corpus.append({"query": rng.choice(MISRECOGNITIONS), "expected": None})
+        else:
+            corpus.append({"query": _clipboard_text(rng), "expected": None})
+    return corpus
+
+
+def save_corpus(path, corpus):
+    with open(path, "w") as f:
+        for entry in corpus:
+            f.write(json.dumps(entry) + "\n")
+
+
+def load_corpus(path):
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,72 @@
+"""Concurrent daily briefing.
+
+A briefing is a list of sources, each a name, a function returning the
+sentences to speak, and a deadline in seconds. All sources are fetched at
+once on a small thread pool, so the briefing takes about as long as its
+slowest source instead of the sum of all of them. Results are still spoken
+in the listed order: each source is spoken as soon as it and every source
+before it are done. A source that fails or misses its deadline (measured from
+the start of the briefing) is replaced by a short apology, and its late result
+is dropped.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import config
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Returns the shared briefing pool, sized so every source can run at once."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=config.BRIEFING_WORKERS, thread_name_prefix="briefing")
+        return _executor
+
+
+class Source:
+    def __init__(self, name, fetch, deadline, unavailable=None):
+        self.name = name
+        self.fetch = fetch
+        self.deadline = deadline
+        self.unavailable = unavailable or f"I couldn't get the {name} in time."
+
+
+def run(sources, speak, executor=None):
+    """Fetches every source concurrently and passes each one's sentences to speak() in order.
+
+    Returns {name: seconds taken, or None if the source failed or timed out}.
+    """
+    executor = executor or get_executor()
+    started = time.monotonic()
+    timings = {}
+
+    def timed(source):
+        begun = time.monotonic()
+        lines = source.fetch()
+        return lines, time.monotonic() - begun
+
+    futures = [(source, executor.submit(timed, source)) for source in sources]
+    for source, future in futures:
+        remaining = source.deadline - (time.monotonic() - started)
+        try:
+            lines, timings[source.name] = future.result(timeout=max(0.0, remaining))
+        except TimeoutError:
+            future.cancel()
+            print(f"Briefing: {source.name} missed its {source.deadline}s deadline")
+            lines = [source.unavailable]
+            timings[source.name] = None
+        except Exception as e:
+            print(f"Briefing Error ({source.name}): {e}")
+            lines = [source.unavailable]
+            timings[source.name] = None
+        for line in lines:
+            speak(line)
+
+    print(f"Briefing: done in {time.monotonic() - started:.2f}s "
+          + ", ".join(f"{name}={'-' if t is None else f'{t:.2f}s'}" for name, t in timings.items()))
+    return timings
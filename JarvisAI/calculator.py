@@ -0,0 +1,283 @@
+"""Spoken arithmetic for perform_calculation.
+
+A query is first rewritten from speech to an expression: number words become
+digits, and spoken operators become symbols ("square root of 16" becomes
+sqrt(16), "2 to the power of 10" becomes 2 ** 10). The expression is then
+parsed with ast and checked against a whitelist of numbers, arithmetic
+operators, constants and math functions before it is compiled. Compiled code
+objects are cached, so a repeated question is not parsed again, and nothing
+outside the whitelist can ever be evaluated.
+
+Ranges ("sine of 0 to 90 step 15", "sum of 1 to a million") are evaluated in a
+single vectorized NumPy pass over the whole range instead of one call per value.
+"""
+import ast
+import decimal
+import math
+import re
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+import config
+
+# ---------- SPOKEN INPUT ----------
+
+UNITS = {"zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+         "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15,
+         "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19}
+TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90}
+SCALES = {"hundred": 100, "thousand": 1000, "million": 10 ** 6, "billion": 10 ** 9, "trillion": 10 ** 12}
+NUMBER_WORD = re.compile(r"\b(?:(?:a|an|and|" + "|".join(list(UNITS) + list(TENS) + list(SCALES)) + r"|\d+)\b[ -]?)+")
+
+# Applied in order, so longer phrases come before the words they contain.
+SPOKEN_OPERATORS = [
+    (r"\bsquare root of\b", " sqrt "), (r"\bcube root of\b", " cbrt "), (r"\bto the power of\b", " ** "),
+    (r"\braised to(?: the)?\b", " ** "), (r"\bpower of\b", " ** "), (r"\bmultiplied by\b", " * "),
+    (r"\bdivided by\b", " / "), (r"\bsquared\b", " ** 2 "), (r"\bcubed\b", " ** 3 "), (r"\bmodulo\b", " % "),
+    (r"\bmod\b", " % "), (r"\bpercent of\b", " / 100 * "), (r"\btimes\b", " * "), (r"\bover\b", " / "),
+    (r"\bplus\b", " + "), (r"\bminus\b", " - "), (r"\bsine\b", " sin "), (r"\bcosine\b", " cos "),
+    (r"\btangent\b", " tan "), (r"\blogarithm\b", " log "), (r"\bnatural log\b", " log "),
+    (r"\^", " ** "),
+]
+FUNCTION_WORDS = {"squares": "square", "square": "square", "cubes": "cube", "cube": "cube",
+                  "square roots": "sqrt", "square root": "sqrt", "sine": "sin", "sin": "sin", "cosine": "cos",
+                  "cos": "cos", "tangent": "tan", "tan": "tan", "log": "log", "logarithm": "log",
+                  "factorial": "factorial", "factorials": "factorial"}
+AGGREGATES = {"sum": np.sum, "total": np.sum, "product": np.prod, "average": np.mean, "mean": np.mean,
+              "maximum": np.max, "minimum": np.min}
+TRIG = {"sin", "cos", "tan"}
+
+
+def words_to_number(words):
+    """Value of a run of number words such as "two hundred and fifty" or "a million"."""
+    total, current = 0, 0
+    for word in re.split(r"[ -]+", words.strip()):
+        if word in ("and", ""):
+            continue
+        if word in ("a", "an"):
+            current = current or 1
+        elif word.isdigit():
+            current += int(word)
+        elif word in UNITS:
+            current += UNITS[word]
+        elif word in TENS:
+            current += TENS[word]
+        elif word == "hundred":
+            current = (current or 1) * 100
+        else:
+            total += (current or 1) * SCALES[word]
+            current = 0
+    return total + current
+
+
+def replace_number_words(text):
+    def convert(match):
+        run = match.group(0)
+        words = [word for word in re.split(r"[ -]+", run.strip()) if word]
+        if not any(word in UNITS or word in TENS or word in SCALES for word in words):
+            return run
+        # A leading "a"/"and" that isn't followed by a scale word is ordinary English.
+        while words and words[0] in ("a", "an", "and") and (len(words) < 2 or words[1] not in SCALES):
+            words.pop(0)
+        while words and words[-1] in ("a", "an", "and"):
+            words.pop()
+        return f" {words_to_number(' '.join(words))} " if words else run
+
+    return NUMBER_WORD.sub(convert, text)
+
+
+def to_expression(spoken):
+    """Rewrites a spoken calculation as a Python expression string."""
+    text = replace_number_words(spoken.lower())
+    for pattern, symbol in SPOKEN_OPERATORS:
+        text = re.sub(pattern, symbol, text)
+    text = re.sub(r"\b(?:what's|what is|calculate)\b|=|\?", " ", text)
+    # "sqrt of 16" / "sqrt 16" -> "sqrt(16)": a function name followed by a bare number takes it as its argument.
+    text = re.sub(r"(-?\d+(?:\.\d+)?)\s*degrees?\b", r"radians(\1)", text)
+    text = re.sub(r"(\d+)\s+factorial\b", r"factorial(\1)", text)
+    text = re.sub(rf"\b({FUNCTION_NAMES})\s+of\b", r"\1", text)
+    text = re.sub(rf"\b({FUNCTION_NAMES})\s+(-?\d+(?:\.\d+)?|radians\(-?\d+(?:\.\d+)?\))", r"\1(\2)", text)
+    return " ".join(text.split())
+
+
+# ---------- VALIDATED COMPILER ----------
+
+def _factorial(n):
+    if n != int(n) or not 0 <= n <= config.CALC_MAX_FACTORIAL:
+        raise ValueError("factorial is limited to whole numbers up to %d" % config.CALC_MAX_FACTORIAL)
+    return math.factorial(int(n))
+
+
+def _power(base, exponent):
+    # Signed magnitude of the result: 10 ** -2000 is tiny, only positive magnitudes are refused.
+    if base != 0 and exponent * math.log10(abs(base)) > config.CALC_MAX_DIGITS:
+        raise ValueError("result too large")
+    if base < 0 and exponent != int(exponent):
+        # Python answers with a complex number here; an odd root of a negative number has a real answer.
+        ratio = Fraction(exponent).limit_denominator(1000)
+        if ratio.denominator % 2 == 0 or abs(float(ratio) - exponent) > 1e-12:
+            raise ValueError("no real result")
+        return (-1) ** ratio.numerator * abs(base) ** exponent
+    return base ** exponent
+
+
+FUNCTIONS = {name: getattr(math, name) for name in (
+    "sqrt", "sin", "cos", "tan", "asin", "acos", "atan", "log", "log10", "log2", "exp", "floor", "ceil",
+    "radians", "degrees", "hypot")}
+FUNCTIONS.update({"abs": abs, "round": round, "cbrt": lambda x: math.copysign(abs(x) ** (1 / 3), x),
+                  "factorial": _factorial, "_pow": _power})
+FUNCTION_NAMES = "|".join(sorted(FUNCTIONS, key=len, reverse=True))
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd)
+
+
+class _PowerGuard(ast.NodeTransformer):
+    """Turns a ** b into _pow(a, b), so a huge exponent fails fast instead of hanging."""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.copy_location(ast.Call(ast.Name("_pow", ast.Load()), [node.left, node.right], []), node)
+        return node
+
+
+def validate(tree):
+    """Raises ValueError unless every node is a number, whitelisted name or call, or arithmetic operator."""
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load) + OPERATORS):
+            continue
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            continue
+        if isinstance(node, ast.Name) and (node.id in FUNCTIONS or node.id in CONSTANTS):
+            continue
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS
+                and not node.keywords):
+            continue
+        raise ValueError(f"not allowed in a calculation: {type(node).__name__}")
+
+
+@lru_cache(maxsize=config.CALC_CACHE_SIZE)
+def compile_expression(expression):
+    """Parses, validates and compiles an expression string; cached per string."""
+    tree = ast.parse(expression, mode="eval")
+    validate(tree)
+    tree = ast.fix_missing_locations(_PowerGuard().visit(tree))
+    return compile(tree, "<calculation>", "eval")
+
+
+def evaluate(expression):
+    result = eval(compile_expression(expression), {"__builtins__": {}}, dict(FUNCTIONS, **CONSTANTS))
+    if isinstance(result, complex):
+        raise ValueError("no real result")
+    return result
+
+
+# ---------- VECTORIZED RANGES ----------
+
+RANGE = re.compile(
+    r"^(?:(?P<aggregate>" + "|".join(AGGREGATES) + r") of (?:the )?)?"
+    r"(?:(?P<function>" + "|".join(sorted(FUNCTION_WORDS, key=len, reverse=True)) + r") of )?"
+    r"(?:all )?(?:the )?(?:numbers )?(?:from )?(?P<start>-?\d+(?:\.\d+)?) (?:to|through) (?P<stop>-?\d+(?:\.\d+)?)"
+    r"(?: (?:step|in steps of|by) (?P<step>\d+(?:\.\d+)?))?(?P<degrees> degrees?)?$")
+
+
+class RangeResult:
+    def __init__(self, label, xs, ys, aggregate=None, value=None, degrees=False):
+        self.label = label
+        self.xs = xs
+        self.ys = ys
+        self.aggregate = aggregate
+        self.value = value
+        self.degrees = degrees
+
+    def table(self, rows=None):
+        """The x/y table as text, eliding the middle of long ranges."""
+        rows = rows or config.CALC_TABLE_ROWS
+        unit = " (degrees)" if self.degrees else ""
+        lines = [f"{'x' + unit:>16}  {self.label:>20}"]
+        indexes = list(range(len(self.xs)))
+        if len(indexes) > rows:
+            indexes = indexes[:rows // 2] + [None] + indexes[-(rows // 2):]
+        for i in indexes:
+            lines.append(f"{'...':>16}  {'...':>20}" if i is None else
+                         f"{format_number(self.xs[i]):>16}  {format_number(self.ys[i]):>20}")
+        if self.aggregate:
+            lines.append(f"{self.aggregate:>16}  {format_number(self.value):>20}")
+        return "\n".join(lines)
+
+
+def evaluate_range(spoken):
+    """Evaluates "<aggregate> of <function> of A to B step S" over the whole range at once.
+
+    Returns a RangeResult, or None if spoken is not a range query.
+    """
+    text = " ".join(replace_number_words(spoken.lower()).replace("?", " ").split())
+    text = re.sub(r"^(?:what is |what's |calculate )?(?:the )?", "", text)
+    match = RANGE.match(text)
+    if not match or not (match.group("aggregate") or match.group("function")):
+        return None
+    start, stop = float(match.group("start")), float(match.group("stop"))
+    step = float(match.group("step") or 1)
+    if step <= 0 or stop < start:
+        raise ValueError("the range must count upwards")
+    count = int((stop - start) // step) + 1
+    if count > config.CALC_RANGE_MAX_POINTS:
+        raise ValueError(f"ranges are limited to {config.CALC_RANGE_MAX_POINTS} values")
+
+    exact = all(value == int(value) for value in (start, stop, step))
+    xs = start + step * np.arange(count, dtype=np.int64 if exact else np.float64)
+    if exact:
+        xs = xs.astype(np.int64)
+    function = FUNCTION_WORDS.get(match.group("function"))
+    # Spoken trig ranges like "0 to 90" mean degrees; within one turn of radians they are taken as radians.
+    degrees = function in TRIG and (bool(match.group("degrees")) or stop > 2 * math.pi)
+    if function is None:
+        ys, label = xs, "x"
+    elif function == "square":
+        ys, label = xs.astype(np.float64) ** 2, "x squared"
+    elif function == "cube":
+        ys, label = xs.astype(np.float64) ** 3, "x cubed"
+    elif function == "factorial":
+        if stop > config.CALC_MAX_FACTORIAL or start < 0 or not exact:
+            raise ValueError("factorial is limited to whole numbers up to %d" % config.CALC_MAX_FACTORIAL)
+        ys, label = np.array([float(math.factorial(int(x))) for x in xs]), "factorial"
+    else:
+        angles = np.radians(xs) if degrees else xs.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ys = getattr(np, function)(angles)
+        label = f"{function}(x)"
+
+    aggregate = match.group("aggregate")
+    if aggregate is None:
+        return RangeResult(label, xs, ys, degrees=degrees)
+    values = ys.astype(np.float64) if aggregate == "product" else ys
+    return RangeResult(label, xs, ys, aggregate, AGGREGATES[aggregate](values).item(), degrees)
+
+
+def format_number(value):
+    """Speakable form: whole numbers without ".0" up to CALC_SPOKEN_DIGITS digits, everything else to
+    CALC_PRECISION significant digits, in scientific notation when it is very large or small."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "undefined"
+        if math.isinf(value):
+            return "infinity" if value > 0 else "minus infinity"
+        if value.is_integer() and abs(value) < 10 ** config.CALC_SPOKEN_DIGITS:
+            return str(int(value))
+        text = f"{value:.{config.CALC_PRECISION}g}"
+        return _spoken_scientific(text) if "e" in text else text
+    if isinstance(value, int) and abs(value) >= 10 ** config.CALC_SPOKEN_DIGITS:
+        return _spoken_scientific(f"{decimal.Decimal(value):.{config.CALC_PRECISION - 1}e}")
+    return str(value)
+
+
+def _spoken_scientific(text):
+    """"1.5e+20" -> "1.5 times ten to the power of 20"."""
+    mantissa, exponent = text.lower().split("e")
+    if "." in mantissa:
+        mantissa = mantissa.rstrip("0").rstrip(".")
+    return f"{mantissa} times ten to the power of {int(exponent)}"
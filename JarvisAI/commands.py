@@ -1,86 +1,75 @@
 import os
 import subprocess
 import webbrowser
-import requests
+import re
 import datetime
 import time
-import math
+import random
 import wikipedia
 import config
-from voice import say
-import shlex
-import sys
+from voice import say, LOW
+import sqlite3
 import platform
 import pyperclip
-import json
+from functools import lru_cache
+import speculation
+import file_index
+import file_walker
+import content_search
+import memory_store
+import todo_store
+import journal
+import http_client
+import response_cache
+import prefetch
+import briefing
+import system_monitor
+import calculator
+import phrases
 try:
     import psutil
 except ImportError:
     psutil = None
 
-MEMORY_FILE = config.MEMORY_FILE
-NOTES_FILE = config.NOTES_FILE
-
-def load_memory():
-    """Loads the memory dictionary from the JSON file."""
-    if os.path.exists(MEMORY_FILE):
-        try:
-            with open(MEMORY_FILE, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            print("Warning: Could not load or parse memory file.")
-            return {}
-    return {}
-
-
-def save_memory(memory_data):
-    """Saves the memory dictionary to the JSON file."""
-    try:
-        with open(MEMORY_FILE, 'w') as f:
-            json.dump(memory_data, f, indent=4)
-    except IOError:
-        print("Error: Could not save memory file.")
+# Phrasings that state a fact without "is"; the rest of the query is the value.
+IMPLIED_FACT_KEYS = {"i am called": "name", "i live in": "city"}
 
 
 def remember_fact(query):
     """Parses a query to extract a key-value fact and saves it."""
-    memory = load_memory()
-
-
-    if "is" in query:
-        parts = query.split(" is ", 1)
-
-
-        key_part = parts[0].replace("remember", "").replace("that", "").replace("my", "").strip()
-        value_part = parts[1].strip()
+    memory = memory_store.get_store()
 
-        key = key_part.replace("your", "").replace("a", "").replace("an", "").strip()
-        key = key.lower().replace(" ", "_")
-
-        if not key or not value_part:
-            say("I couldn't clearly identify the fact you want me to remember. Try phrases like 'remember my favorite color is blue'.")
+    for phrase, implied_key in IMPLIED_FACT_KEYS.items():
+        if phrase in query:
+            key, value_part = implied_key, query.split(phrase, 1)[1].strip(" .")
+            break
+    else:
+        parts = re.split(r"\s+(?:is|are)\s+", query, maxsplit=1)
+        if len(parts) < 2:
+            say("To save a fact, use a sentence with 'is', like 'remember my hometown is New Delhi'.")
             return
+        key, value_part = memory_store.fact_key(parts[0]), parts[1].strip(" .")
 
-        memory[key] = value_part.capitalize()
-        save_memory(memory)
-        say(f"Okay, I'll remember that your {key_part} is {value_part}.")
-        print(f"Memory saved: {key_part} -> {value_part}")
-    else:
-        say("To save a fact, use a sentence with 'is', like 'remember my hometown is New Delhi'.")
+    if not key or not value_part:
+        say("I couldn't clearly identify the fact you want me to remember. Try phrases like 'remember my favorite color is blue'.")
+        return
 
+    key_part = key.replace("_", " ")
+    memory.set(key, value_part.capitalize())
+    say(f"Okay, I'll remember that your {key_part} is {value_part}.")
+    print(f"Memory saved: {key_part} -> {value_part}")
 
-def recall_fact(query):
-    """Parses a query to find a key and recalls the corresponding value."""
-    memory = load_memory()
 
-    # Logic to identify the key being asked about
-    key_phrases = query.replace("what is", "").replace("where is", "").replace("tell me about", "").replace(
-        "what is my", "").replace("what are my", "").strip()
-    key = key_phrases.split("?")[-1].split("your")[-1].split("my")[-1].strip()
-    key = key.lower().replace(" ", "_")
-
-    if key in memory:
-        say(f"I remember you told me that your {key.replace('_', ' ')} is {memory[key]}.")
+def recall_fact(query):
+    """Finds the stored fact closest to what the query asks about and recalls it."""
+    memory = memory_store.get_store()
+    key = memory_store.fact_key(query)
+
+    match = memory.find(key) if key else None
+    if match:
+        found_key, value, confidence = match
+        print(f"Memory recall: '{key}' -> '{found_key}' (confidence {confidence:.2f})")
+        say(f"I remember you told me that your {found_key.replace('_', ' ')} is {value}.")
     elif key:
         say(f"I don't specifically remember anything about your {key.replace('_', ' ')}. Would you like me to remember it?")
     else:
@@ -88,18 +77,16 @@ def recall_fact(query):
 
 
 def forget_fact(query):
-    """Parses a query to find a key and deletes the fact from memory."""
-    memory = load_memory()
-
-    key_phrases = query.replace("forget that", "").replace("forget about", "").replace(
-        "delete the fact that", "").replace("clear my", "").strip()
-    key = key_phrases.split("?")[-1].split("your")[-1].split("my")[-1].strip()
-    key = key.lower().replace(" ", "_")
-
-    if key in memory:
-        value = memory.pop(key)
-        save_memory(memory)
-        say(f"I have successfully forgotten that your {key.replace('_', ' ')} was {value}.")
+    """Finds the stored fact closest to what the query names and deletes it from memory."""
+    memory = memory_store.get_store()
+    key = memory_store.fact_key(query)
+
+    match = memory.find(key) if key else None
+    if match:
+        found_key, _, confidence = match
+        print(f"Memory forget: '{key}' -> '{found_key}' (confidence {confidence:.2f})")
+        value = memory.delete(found_key)
+        say(f"I have successfully forgotten that your {found_key.replace('_', ' ')} was {value}.")
     elif key:
         say(f"I don't seem to have a fact stored for {key.replace('_', ' ')}.")
     else:
@@ -142,17 +129,34 @@ def create_note(query):
         say("What would you like the note to say?")
         return
 
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    formatted_note = f"\n--- {timestamp} ---\n{note_content}\n"
-
     try:
-        with open(NOTES_FILE, "a") as f:
-            f.write(formatted_note)
+        journal.get_journal().add(note_content)
         say(f"Noted! I've saved a new entry: {note_content[:30]}...")
     except Exception:
         say("Sorry, I couldn't save your note.")
 
 
+def search_notes(keywords="", start=None, end=None):
+    """Reads back the newest journal entries matching the keywords and date range."""
+    try:
+        entries = journal.get_journal().search(keywords, start, end)
+    except Exception as e:
+        say("Sorry, I couldn't search your notes.")
+        print(f"Notes Search Error: {e}")
+        return
+
+    about = f" about {keywords}" if keywords else ""
+    if not entries:
+        say(f"I couldn't find any notes{about}.")
+        return
+    say(f"I found {len(entries)} {'note' if len(entries) == 1 else 'notes'}{about}. Here is the most recent first.")
+    this_year = datetime.date.today().year
+    for stamp, text in entries:
+        noted = datetime.datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S")
+        when = noted.strftime("%B %d" if noted.year == this_year else "%B %d, %Y")
+        say(f"On {when}, you noted: {text}", LOW)
+
+
 def set_system_volume(query):
     """Attempts to set the system volume to a specified percentage (macOS/Linux)."""
     parts = query.split()
@@ -193,6 +197,54 @@ def set_system_volume(query):
         print("Volume Control Error:", e)
 
 
+def diagnostics_report():
+    """Returns the spoken system diagnostics, from the background sampler's history when it runs."""
+    if config.METRICS_ENABLED:
+        sampler = system_monitor.get_sampler()
+        if sampler.current("cpu") is None:
+            sampler.sample()
+    else:
+        # No background sampling: take a single reading now rather than starting the sampler thread.
+        sampler = system_monitor.Sampler()
+        sampler.sample(cpu_interval=1)
+
+    parts = []
+    battery = sampler.current("battery")
+    if battery is not None:
+        is_charging = "and is currently charging" if sampler.plugged else "and is running on battery"
+        parts.append(f"Your battery is at {battery:.0f} percent {is_charging}.")
+    else:
+        parts.append("Battery status could not be retrieved.")
+
+    available_mem_gb = sampler.memory_available / (1024 ** 3)
+    total_mem_gb = sampler.memory_total / (1024 ** 3)
+    if sampler.samples > 1:
+        cpu_minute, cpu_five = sampler.average("cpu", 60), sampler.average("cpu", 300)
+        parts.append(f"CPU usage is currently at {sampler.current('cpu'):.0f} percent, averaging {cpu_minute:.0f} "
+                     f"over the last minute and {cpu_five:.0f} over five minutes.")
+        parts.append(f"You are using {sampler.current('memory'):.0f} percent of your memory, "
+                     f"{sampler.average('memory', 300):.0f} on average over five minutes, with {available_mem_gb:.2f} "
+                     f"gigabytes available out of {total_mem_gb:.2f} gigabytes total.")
+    else:
+        parts.append(f"CPU usage is currently at {sampler.current('cpu'):.0f} percent.")
+        parts.append(f"You are using {sampler.current('memory'):.0f} percent of your memory, with "
+                     f"{available_mem_gb:.2f} gigabytes available out of {total_mem_gb:.2f} gigabytes total.")
+    disk = sampler.current("disk")
+    if disk is not None:
+        parts.append(f"Your disk is {disk:.0f} percent full.")
+    if sampler.top_processes:
+        name, cpu = sampler.top_processes[0]
+        parts.append(f"The busiest process is {name} at {cpu:.0f} percent CPU.")
+    return " ".join(parts)
+
+
+def start_monitor():
+    """Starts sampling system metrics in the background, speaking threshold alerts as they happen."""
+    if psutil is None or not config.METRICS_ENABLED:
+        return
+    system_monitor.get_sampler(alert=say)
+
+
 def run_diagnostics():
     """Checks and reports system usage metrics (CPU, Memory, Battery)."""
     if psutil is None:
@@ -200,25 +252,7 @@ def run_diagnostics():
         return
 
     try:
-        # CPU Usage
-        cpu_percent = psutil.cpu_percent(interval=1)
-
-        memory = psutil.virtual_memory()
-        mem_percent = memory.percent
-        total_mem_gb = memory.total / (1024 ** 3)
-        available_mem_gb = memory.available / (1024 ** 3)
-
-        battery_info = psutil.sensors_battery()
-        battery_status = ""
-        if battery_info:
-            percent = battery_info.percent
-            is_charging = "and is currently charging" if battery_info.power_plugged else "and is running on battery"
-            battery_status = f"Your battery is at {percent} percent {is_charging}. "
-        else:
-            battery_status = "Battery status could not be retrieved. "
-
-        say(f"Running system diagnostics. {battery_status}CPU usage is currently at {cpu_percent} percent. You are using {mem_percent} percent of your memory, with {available_mem_gb:.2f} gigabytes available out of {total_mem_gb:.2f} gigabytes total.")
-
+        say(f"Running system diagnostics. {diagnostics_report()}")
     except Exception as e:
         say("An error occurred while trying to run system diagnostics.")
         print(f"Diagnostics Error: {e}")
@@ -265,47 +299,81 @@ def convert_units(query):
 def search_local_files(keyword):
     """
     Searches the local filesystem for files matching a keyword in the user's home directory.
+    Uses the persistent file index once it has been built, and walks the disk until then.
     """
+    index = file_index.get_index()
+    found_files = None
+    try:
+        if index.is_ready():
+            found_files = index.search(keyword, limit=5)
+            print(f"File Search: index lookup for '{keyword}' ({index.stats()['files']} files indexed)")
+    except sqlite3.Error as e:
+        print(f"File Index Error: {e}; walking the disk instead.")
+    if found_files is None:
+        found_files = walk_for_files(keyword)
+        if found_files is None:
+            return
+
+    if found_files:
+        say(f"I found {len(found_files)} files related to '{keyword}'. The first one is: {found_files[0]}. I have printed the full list to the console/log.")
+        print("--- Found Files ---")
+        for i, f in enumerate(found_files):
+            print(f"({i+1}): {f}")
+        print("-------------------")
+    else:
+        say(f"Sorry, I couldn't find any files matching '{keyword}' in your main directories.")
+
+
+def walk_for_files(keyword, search_limit=5):
+    """Crawls the home directory for matching file names; used while the file index is still building."""
     base_path = os.path.expanduser("~")
 
     say(f"Searching for files containing '{keyword}' in your home directory. This may take a moment.")
     print(f"File Search: Starting in {base_path} for '{keyword}'")
 
     found_files = []
-    search_limit = 5
-
     try:
-        for root, dirs, files in os.walk(base_path, topdown=True):
-            # Exclude common system/hidden directories for performance
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d.lower() not in ('library', 'appdata', 'node_modules')]
-
-            for file in files:
-                if keyword.lower() in file.lower():
-                    found_files.append(os.path.join(root, file))
-                    if len(found_files) >= search_limit:
-                        break
-            if len(found_files) >= search_limit:
-                break
+        for path in file_walker.find_files(keyword, base_path, search_limit):
+            found_files.append(path)
+            if len(found_files) == 1:
+                say(f"The first match is {os.path.basename(path)}. Still looking for more.")
     except Exception as e:
         say("An error occurred during file search due to permission issues.")
         print(f"File Search Error: {e}")
+        return None
+    return found_files
+
+def search_file_contents(keyword, limit=10):
+    """Searches inside text files under the home directory and streams matching lines to the console/log."""
+    say(f"Searching inside your files for '{keyword}'.")
+    print(f"Content Search: Starting in {os.path.expanduser('~')} for '{keyword}'")
+    start = time.perf_counter()
+    matches = []
+    try:
+        for path, line_number, line in content_search.search_contents(keyword, limit=limit,
+                                                                       index=content_search.get_index()):
+            matches.append(path)
+            print(f"({len(matches)}) {path}:{line_number}: {line}")
+            if len(matches) == 1:
+                say(f"The first match is in {os.path.basename(path)}. Still looking for more.")
+    except Exception as e:
+        say("An error occurred while searching inside your files.")
+        print(f"Content Search Error: {e}")
         return
+    print(f"Content Search: {len(matches)} matches in {time.perf_counter() - start:.2f}s")
 
-    if found_files:
-        say(f"I found {len(found_files)} files related to '{keyword}'. The first one is: {found_files[0]}. I have printed the full list to the console/log.")
-        print("--- Found Files ---")
-        for i, f in enumerate(found_files):
-            print(f"({i+1}): {f}")
-        print("-------------------")
+    if matches:
+        say(f"I found '{keyword}' in {len(set(matches))} files. I have printed the matching lines to the console/log.")
     else:
-        say(f"Sorry, I couldn't find any files matching '{keyword}' in your main directories.")
+        say(f"Sorry, I couldn't find '{keyword}' inside any of your files.")
+
 
 def process_clipboard():
     """Fetches the current clipboard content and automatically processes it."""
     try:
         content = pyperclip.paste()
         if not content:
-            say("Your clipboard is currently empty.")
+            say(phrases.CLIPBOARD_EMPTY)
             return
 
         display_content = content[:50] + "..." if len(content) > 50 else content
@@ -388,26 +456,51 @@ def get_date():
     say(f"Today's date is {current_date}.")
 
 def perform_calculation(expression):
-    """Evaluates a mathematical expression."""
+    """Evaluates a spoken calculation, or a whole range at once ("sine of 0 to 90 step 15")."""
     try:
-        expression = expression.replace("times", "*").replace("multiplied by", "*")
-        expression = expression.replace("divided by", "/").replace("over", "/")
-        expression = expression.replace("plus", "+").replace("minus", "-")
-        expression = expression.replace("^", "**").replace("power of", "**")
-        result = eval(expression, {"__builtins__": None}, math.__dict__)
-        say(f"The answer is {result}")
-    except Exception:
-        say("Sorry, I couldn't calculate that.")
+        ranged = calculator.evaluate_range(expression)
+        if ranged is not None:
+            print(ranged.table())
+            if ranged.aggregate:
+                say(f"The {ranged.aggregate} is {calculator.format_number(ranged.value)}.")
+            else:
+                say(f"I've worked out {ranged.label} for {len(ranged.xs)} values. The table is in the log.")
+            return
+        result = calculator.evaluate(calculator.to_expression(expression))
+        say(f"The answer is {calculator.format_number(result)}")
+    except Exception as e:
+        print(f"Calculation Error: {e}")
+        say(phrases.CALCULATION_FAILED)
+
+@lru_cache(maxsize=64)
+def resolve_app(app_name):
+    """Finds the macOS application bundle matching a spoken name, or returns the name unchanged.
+
+    Only application folders are searched; other platforms hand the name to their desktop launcher as is.
+    """
+    if platform.system() == "Darwin":
+        wanted = f"{app_name.lower()}.app"
+        for folder in ("/Applications", "/System/Applications", os.path.expanduser("~/Applications")):
+            try:
+                entries = os.listdir(folder)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.lower() == wanted:
+                    return os.path.join(folder, entry)
+    return app_name
+
 
 def open_app(app_name):
     """Opens a specified application (Cross-platform compatible attempt)."""
     try:
+        target = speculation.result_for(("open", app_name), resolve_app, app_name)
         if platform.system() == "Darwin":
-            subprocess.run(["open", "-a", app_name], check=True)
+            subprocess.run(["open", "-a", target], check=True)
         elif platform.system() == "Windows":
-            subprocess.run(["start", app_name], check=True, shell=True)
+            subprocess.run(["start", target], check=True, shell=True)
         elif platform.system() == "Linux":
-            subprocess.run(["xdg-open", app_name], check=True)
+            subprocess.run(["xdg-open", target], check=True)
         say(f"Opening {app_name}")
     except subprocess.CalledProcessError:
         say(f"Couldn't find or open the app {app_name}.")
@@ -488,51 +581,140 @@ def play_music():
         say("Couldn't open the music application. Opening YouTube Music in the browser.")
         webbrowser.open("https://music.youtube.com")
 
-def get_weather(city="Delhi"):
+def request_weather(city):
+    """Returns the raw OpenWeatherMap response for a city."""
+    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={config.WEATHER_API_KEY}&units=metric"
+    return http_client.get_json(url)
+
+
+def fetch_weather(city):
+    """Returns the OpenWeatherMap response for a city, from the response cache while it is recent."""
+    return response_cache.get_cache().get("weather", city.lower(), request_weather, city,
+                                          keep=lambda res: res.get("cod") == 200)
+
+
+def prefetch_weather(city):
+    """Background job: refreshes the weather for city in the response cache."""
+    res = request_weather(city)
+    if res.get("cod") != 200:
+        raise RuntimeError(res.get("message", "weather API error"))
+    response_cache.get_cache().put("weather", city.lower(), res)
+    return res
+
+
+def keep_weather_warm(cities):
+    """Keeps the weather for cities refreshed and stops refreshing cities that dropped out of them."""
+    refresher = prefetch.get_refresher()
+    wanted = {("weather", city) for city in cities}
+    for key in refresher.job_keys("weather"):
+        if key not in wanted:
+            refresher.remove_job(key)
+    for city in cities:
+        refresher.add_job(("weather", city), lambda city=city: prefetch_weather(city), config.PREFETCH_WEATHER_INTERVAL)
+
+
+def start_prefetch():
+    """Starts keeping news and the most-asked cities' weather warm in the background."""
+    if not config.PREFETCH_ENABLED:
+        return
+    refresher = prefetch.get_refresher()
+    if config.NEWS_API_KEY:
+        refresher.add_job("news", request_news, config.PREFETCH_NEWS_INTERVAL)
+    if config.WEATHER_API_KEY:
+        keep_weather_warm(refresher.top_cities())
+    refresher.start()
+
+
+def current_weather(city):
+    """Returns the weather response for city from a recent prefetched snapshot, else from the cache or API."""
+    snap = prefetch.get_refresher().snapshot(("weather", city.lower()))
+    if snap:
+        print(f"Weather: prefetched snapshot for {city} from {snap.describe_age()}")
+        return snap.value
+    return speculation.result_for(("weather", city), fetch_weather, city)
+
+
+def describe_weather(city, res):
+    """Spoken form of a successful weather response."""
+    temp = res["main"]["temp"]
+    desc = res["weather"][0]["description"]
+    humidity = res["main"]["humidity"]
+    wind_speed = res["wind"]["speed"]
+    return f"The temperature in {city} is {temp}°C with {desc}. Humidity is {humidity} percent and wind speed is {wind_speed} meters per second."
+
+
+def get_weather(city=config.DEFAULT_CITY):
     """Fetches and reports the current weather for a specified city."""
     if not config.WEATHER_API_KEY:
         say("Weather API key is missing. Please set it in config.py.")
         return
     try:
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={config.WEATHER_API_KEY}&units=metric"
-        res = requests.get(url, timeout=5).json()
+        res = current_weather(city)
         if res.get("cod") == 200:
-            temp = res["main"]["temp"]
-            desc = res["weather"][0]["description"]
-            humidity = res["main"]["humidity"]
-            wind_speed = res["wind"]["speed"]
-            say(f"The temperature in {city} is {temp}°C with {desc}. Humidity is {humidity} percent and wind speed is {wind_speed} meters per second.")
+            say(describe_weather(city, res))
+            if config.PREFETCH_ENABLED:
+                keep_weather_warm(prefetch.get_refresher().note_city(city))
         elif res.get("cod") == "404":
             say(f"City '{city}' not found.")
         else:
             say("Could not fetch weather data due to an API issue.")
     except Exception as e:
-        say("Couldn't fetch the weather.")
+        say(phrases.WEATHER_FAILED)
+
+def request_news():
+    """Returns the top five headlines as NewsAPI article dicts."""
+    url = f"https://newsapi.org/v2/top-headlines?country=in&apiKey={config.NEWS_API_KEY}"
+    res = http_client.get_json(url)
+    if res.get("status") == "error":
+        raise RuntimeError(res.get("message", "news API error"))
+    return res.get("articles", [])[:5]
+
+
+def latest_headlines():
+    """Returns the top articles, from the prefetched snapshot when there is a recent one."""
+    refresher = prefetch.get_refresher()
+    snap = refresher.snapshot("news")
+    if snap:
+        print(f"News: prefetched headlines from {snap.describe_age()}")
+        return snap.value
+    articles = request_news()
+    refresher.store("news", articles)
+    return articles
+
 
 def get_news():
-    """Fetches and reports the top news headlines."""
+    """Reports the top news headlines."""
     if not config.NEWS_API_KEY:
         say("News API key is missing. Please set it in config.py.")
         return
     try:
-        url = f"https://newsapi.org/v2/top-headlines?country=in&apiKey={config.NEWS_API_KEY}"
-        res = requests.get(url, timeout=5).json()
-        articles = res.get("articles", [])[:5]
+        articles = latest_headlines()
         if not articles:
             say("I couldn't find any latest news.")
             return
         say(f"Here are the top {len(articles)} headlines for today.")
         for i, article in enumerate(articles, start=1):
             title = article.get("title", "No title")
-            say(f"Headline {i}: {title}")
-        say("That's all the latest news for now.")
+            say(f"Headline {i}: {title}", LOW)
+        say(phrases.NEWS_DONE, LOW)
     except Exception as e:
-        say("Sorry, I couldn't fetch the latest news.")
+        say(phrases.NEWS_FAILED)
+
+def request_wikipedia_summary(query):
+    """Returns a three-sentence Wikipedia summary for query."""
+    http_client.install_wikipedia()
+    return wikipedia.summary(query, sentences=3, auto_suggest=True, redirect=True)
+
+
+def fetch_wikipedia_summary(query):
+    """Returns the Wikipedia summary for query, from the response cache while it is recent."""
+    return response_cache.get_cache().get("wikipedia", query.lower(), request_wikipedia_summary, query)
+
 
 def search_wikipedia(query):
     """Searches Wikipedia and provides a summary."""
     try:
-        summary = wikipedia.summary(query, sentences=3, auto_suggest=True, redirect=True)
+        summary = speculation.result_for(("wikipedia", query), fetch_wikipedia_summary, query)
         full_response = "According to Wikipedia, "
         sentences = [s.strip() for s in summary.split('.') if s.strip()]
         full_response += ". ".join(sentences) + "."
@@ -543,13 +725,35 @@ def search_wikipedia(query):
         options = ", ".join(e.options[:3])
         say(f"Your search for {query} is ambiguous. Did you mean: {options}?")
     except Exception as e:
-        say("An error occurred while searching Wikipedia.")
+        say(phrases.WIKIPEDIA_FAILED)
+
+def request_jokes():
+    """Fetches a batch of jokes so most requests never touch the network."""
+    url = ("https://v2.jokeapi.dev/joke/Any?blacklistFlags=nsfw,religious,political,racist,sexist,explicit"
+           f"&amount={config.JOKE_BATCH_SIZE}")
+    res = http_client.get_json(url)
+    return res.get("jokes") or ([res] if res.get("type") else [])
+
+
+_joke_cursor = {"next": None}
+
 
 def tell_a_joke():
-    """Fetches a random joke from a public API."""
+    """Tells the next joke from the cached batch, fetching a new batch in the background when it runs out."""
     try:
-        url = "https://v2.jokeapi.dev/joke/Any?blacklistFlags=nsfw,religious,political,racist,sexist,explicit"
-        res = requests.get(url, timeout=5).json()
+        cache = response_cache.get_cache()
+        jokes = cache.get("joke", "batch", request_jokes, keep=bool)
+        if not jokes:
+            say("I'm having trouble connecting to my humor database, but here's one: Why did the programmer quit his job? Because he didn't get arrays!")
+            return
+        if _joke_cursor["next"] is None:
+            _joke_cursor["next"] = random.randrange(len(jokes))
+        res = jokes[_joke_cursor["next"] % len(jokes)]
+        _joke_cursor["next"] += 1
+        if _joke_cursor["next"] >= len(jokes):
+            _joke_cursor["next"] = 0
+            cache.refresh("joke", "batch", request_jokes, keep=bool)
+
         if res.get('type') == 'single':
             joke = res.get('joke')
             say(joke)
@@ -562,41 +766,163 @@ def tell_a_joke():
         else:
              say("I'm having trouble connecting to my humor database, but here's one: Why did the programmer quit his job? Because he didn't get arrays!")
     except Exception as e:
-        say("Sorry, I can't think of a joke right now.")
+        say(phrases.JOKE_FAILED)
 
 def add_todo(task):
-    """Adds a task to the to-do list file."""
+    """Adds a task to the to-do list, picking up a due day and priority from the wording."""
     try:
-        with open(config.TODO_FILE, "a") as f:
-            f.write(f"- {task.strip()}\n")
-        say(f"Added '{task.strip()}' to your to-do list.")
+        text, due, priority = todo_store.parse_task(task.strip())
+        if not text:
+            say(phrases.ASK_TASK)
+            return
+        task_id = todo_store.get_store().add(text, due, priority)
+        print(f"To-do: added #{task_id} '{text}' (due {due}, priority {priority})")
+        say(f"Added '{text}' to your to-do list.")
     except Exception:
         say("Sorry, I couldn't save the task.")
 
-def view_todo():
-    """Reads and speaks the current to-do list."""
+
+_todo_page = {"offset": 0}
+
+
+def view_todo(more=False):
+    """Speaks the to-do list one page at a time; more=True continues from the last page."""
     try:
-        if not os.path.exists(config.TODO_FILE) or os.stat(config.TODO_FILE).st_size == 0:
-            say("Your to-do list is empty. Do you want to add a task?")
+        store = todo_store.get_store()
+        offset = _todo_page["offset"] if more else 0
+        tasks = store.pending(config.TODO_PAGE_SIZE, offset)
+        if not tasks:
+            if offset:
+                say("That's all of your tasks.")
+            else:
+                say(phrases.TODO_EMPTY_OFFER)
             return
-        with open(config.TODO_FILE, "r") as f:
-            tasks = f.readlines()
+        if not offset:
+            say(phrases.TODO_HEADER)
+        for i, task in enumerate(tasks, start=offset + 1):
+            say(f"Task {i}: {task.describe()}", LOW)
+        _todo_page["offset"] = offset + len(tasks)
+        remaining = store.count_pending() - _todo_page["offset"]
+        if remaining > 0:
+            say(f"You have {remaining} more. Say 'more tasks' to hear them.", LOW)
+    except Exception:
+        say("Sorry, I couldn't read your to-do list.")
+
+
+def view_todays_tasks():
+    """Speaks the tasks that are due today or overdue."""
+    try:
+        tasks = todo_store.get_store().due_by()
+        if not tasks:
+            say("Nothing on your to-do list is due today.")
+            return
+        say(f"You have {len(tasks)} {'task' if len(tasks) == 1 else 'tasks'} due today:")
+        for task in tasks[:config.TODO_PAGE_SIZE]:
+            say(task.describe(), LOW)
+        if len(tasks) > config.TODO_PAGE_SIZE:
+            say(f"And {len(tasks) - config.TODO_PAGE_SIZE} more.", LOW)
+    except Exception:
+        say("Sorry, I couldn't read your to-do list.")
+
+
+def view_top_tasks(count=3):
+    """Speaks the count most important pending tasks."""
+    try:
+        tasks = todo_store.get_store().pending(count)
         if not tasks:
-            say("Your to-do list is empty.")
+            say(phrases.TODO_EMPTY)
             return
-        say("Here are your current tasks:")
-        for i, task in enumerate(tasks):
-            say(f"Task {i + 1}: {task.strip().lstrip('- ')}")
+        say(f"Your top {len(tasks)} tasks are:")
+        for i, task in enumerate(tasks, start=1):
+            say(f"Task {i}: {task.describe()}", LOW)
     except Exception:
         say("Sorry, I couldn't read your to-do list.")
 
+
+def complete_todo(reference):
+    """Marks one task done, by its spoken number or by part of its text."""
+    try:
+        task = todo_store.get_store().complete(reference)
+        if task:
+            say(f"Marked '{task.text}' as done.")
+        else:
+            say(f"I couldn't find a task matching '{reference}'.")
+    except Exception:
+        say("Sorry, I couldn't update your to-do list.")
+
+
+def remove_todo(reference):
+    """Deletes one task, by its spoken number or by part of its text."""
+    try:
+        task = todo_store.get_store().remove(reference)
+        if task:
+            say(f"Removed '{task.text}' from your to-do list.")
+        else:
+            say(f"I couldn't find a task matching '{reference}'.")
+    except Exception:
+        say("Sorry, I couldn't update your to-do list.")
+
+
 def clear_todo():
-    """Clears the to-do list file."""
+    """Deletes every task on the to-do list."""
     try:
-        if os.path.exists(config.TODO_FILE):
-            os.remove(config.TODO_FILE)
-            say("Your to-do list has been cleared.")
+        pending, completed = todo_store.get_store().clear()
+        if pending:
+            say(phrases.TODO_CLEARED)
+        elif completed:
+            say(f"You had no open tasks, so I only removed {completed} completed "
+                f"{'task' if completed == 1 else 'tasks'}.")
         else:
-            say("Your to-do list is already empty.")
+            say(phrases.TODO_ALREADY_EMPTY)
     except Exception:
-        say("Sorry, I couldn't clear your to-do list.")
\ No newline at end of file
+        say("Sorry, I couldn't clear your to-do list.")
+
+# ---------- DAILY BRIEFING ----------
+
+def briefing_weather():
+    if not config.WEATHER_API_KEY:
+        return []
+    res = current_weather(config.DEFAULT_CITY)
+    if res.get("cod") != 200:
+        raise RuntimeError(res.get("message", "weather API error"))
+    return [describe_weather(config.DEFAULT_CITY, res)]
+
+
+def briefing_news():
+    if not config.NEWS_API_KEY:
+        return []
+    titles = [article.get("title", "No title") for article in latest_headlines()[:config.BRIEFING_HEADLINES]]
+    if not titles:
+        return ["There are no headlines right now."]
+    return ["In the news: " + titles[0] + "."] + [f"Also, {title}." for title in titles[1:]]
+
+
+def briefing_todo():
+    store = todo_store.get_store()
+    due = store.due_by()
+    pending = store.count_pending()
+    if not pending:
+        return [phrases.TODO_EMPTY]
+    lines = [f"You have {pending} open {'task' if pending == 1 else 'tasks'}, {len(due)} due today."]
+    lines.extend(task.describe() for task in due[:config.TODO_PAGE_SIZE])
+    return lines
+
+
+def briefing_diagnostics():
+    if psutil is None:
+        return []
+    return [diagnostics_report()]
+
+
+def daily_briefing():
+    """Speaks the time, weather, headlines, today's tasks and system status, fetched all at once."""
+    now = datetime.datetime.now()
+    say(f"Here is your briefing. It's {now.strftime('%I:%M %p')} on {now.strftime('%A, %B %d')}.")
+    deadlines = config.BRIEFING_DEADLINES
+    briefing.run([
+        briefing.Source("weather", briefing_weather, deadlines["weather"]),
+        briefing.Source("news", briefing_news, deadlines["news"], "I couldn't get the headlines in time."),
+        briefing.Source("to-do list", briefing_todo, deadlines["todo"]),
+        briefing.Source("system status", briefing_diagnostics, deadlines["diagnostics"]),
+    ], lambda line: say(line, LOW))
+    say("That's your briefing.", LOW)
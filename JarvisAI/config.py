@@ -6,9 +6,131 @@ base_dir = os.path.join(os.path.expanduser("~"), "Documents", "Jarvis_Data")
 if not os.path.exists(base_dir):
     os.makedirs(base_dir)
 
-TODO_FILE = os.path.join(base_dir, "todo_list.txt")
+TODO_FILE = os.path.join(base_dir, "todo_list.txt")  # legacy list, imported into TODO_DB on first use
+TODO_DB = os.path.join(base_dir, "todo.db")
+TODO_PAGE_SIZE = 5
 MEMORY_FILE = os.path.join(base_dir, "assistant_memory.json")
+MEMORY_COMPACT_EVERY = 100
+# Minimum trigram similarity (0-1) for recall/forget to accept a fuzzy key match.
+MEMORY_MATCH_THRESHOLD = 0.45
 NOTES_FILE = os.path.join(base_dir, "assistant_notes.txt")
+FILE_INDEX_DB = os.path.join(base_dir, "file_index.db")
+FILE_INDEX_REFRESH_SECONDS = 600
+FILE_INDEX_COMMIT_DIRS = 500  # directories per transaction while the index is first built
+# Directories skipped by file search and the file index (compared lowercase).
+SEARCH_SKIP_HIDDEN = True
+SEARCH_EXCLUDED_DIRS = {'library', 'appdata', 'node_modules', '__pycache__', 'venv', 'site-packages',
+                        '$recycle.bin', 'system volume information', 'windows', 'program files',
+                        'program files (x86)'}
+SEARCH_WALK_WORKERS = 8
+# "search inside files for ...": files larger than this are skipped; the content index is optional.
+CONTENT_SEARCH_MAX_BYTES = 20 * 1024 * 1024
+CONTENT_SEARCH_WORKERS = max(2, (os.cpu_count() or 2) - 1)
+CONTENT_INDEX_ENABLED = True
+CONTENT_INDEX_DB = os.path.join(base_dir, "content_index.db")
+CONTENT_INDEX_MAX_FILE_BYTES = 1024 * 1024
+CONTENT_INDEX_MAX_TOTAL_BYTES = 200 * 1024 * 1024
+DEFAULT_CITY = "Delhi"
+# Shared HTTP session (http_client.py): timeouts in seconds, retries for idempotent requests only.
+HTTP_CONNECT_TIMEOUT = 3
+HTTP_READ_TIMEOUT = 10
+HTTP_HOST_TIMEOUTS = {'api.openweathermap.org': 5, 'newsapi.org': 5, 'v2.jokeapi.dev': 4, 'en.wikipedia.org': 8}
+HTTP_RETRIES = 2
+HTTP_BACKOFF = 0.3
+HTTP_POOL_HOSTS = 8
+HTTP_POOL_SIZE = 4
+HTTP_USER_AGENT = "JarvisAI voice assistant"
+# Where network commands get their responses (http_standin.py):
+#   "live"    - the real APIs
+#   "record"  - the real APIs, saving every response as a cassette in HTTP_CASSETTE_DIR
+#   "replay"  - recorded cassettes only; unrecorded requests fail and nothing touches the network
+#   "standin" - a local server answering from cassettes or synthetic payloads, shaped by the settings below
+HTTP_BACKEND = "live"
+HTTP_CASSETTE_DIR = os.path.join(base_dir, "http_cassettes")
+HTTP_STANDIN_PORT = 0  # 0 picks a free port
+HTTP_STANDIN_LATENCY_MS = 80
+HTTP_STANDIN_JITTER_MS = 20
+HTTP_STANDIN_ERROR_RATE = 0.0  # share of requests answered with a 503
+HTTP_STANDIN_PAYLOAD_BYTES = 2000  # rough size of synthetic news and Wikipedia payloads
+HTTP_STANDIN_SEED = 0
+# Response cache (response_cache.py): (fresh, stale) seconds per source. Stale answers are served
+# while a background refresh runs; past the stale window the fetch happens in the foreground.
+RESPONSE_CACHE_DB = os.path.join(base_dir, "response_cache.db")
+RESPONSE_CACHE_MEMORY_ITEMS = 256
+RESPONSE_CACHE_MAX_BYTES = 20 * 1024 * 1024
+RESPONSE_CACHE_TTLS = {
+    'weather': (10 * 60, 3 * 60 * 60),
+    'wikipedia': (7 * 24 * 60 * 60, 60 * 24 * 60 * 60),
+    'joke': (24 * 60 * 60, 30 * 24 * 60 * 60),
+}
+JOKE_BATCH_SIZE = 10
+# Background prefetch (prefetch.py) of news and the weather for DEFAULT_CITY plus the most-asked cities.
+PREFETCH_ENABLED = True
+PREFETCH_NEWS_INTERVAL = 15 * 60
+PREFETCH_WEATHER_INTERVAL = 10 * 60
+PREFETCH_WEATHER_CITIES = 3
+PREFETCH_JITTER = 0.2
+PREFETCH_MAX_BACKOFF = 60 * 60
+PREFETCH_MAX_AGE = 30 * 60  # older snapshots are not used to answer
+PREFETCH_STATE_FILE = os.path.join(base_dir, "prefetch_state.json")
+# Daily briefing: every source is fetched at once; seconds from the start before a source is skipped.
+BRIEFING_DEADLINES = {"weather": 5, "news": 5, "todo": 2, "diagnostics": 3}
+BRIEFING_WORKERS = 4
+BRIEFING_HEADLINES = 3
+# Background system metrics (system_monitor.py) for diagnostics and spoken alerts.
+METRICS_ENABLED = True
+METRICS_INTERVAL = 2  # seconds between CPU/memory samples
+METRICS_SLOW_EVERY = 15  # disk, battery and processes every this many samples
+METRICS_HISTORY_SECONDS = 5 * 60
+METRICS_TOP_PROCESSES = 3
+METRICS_DISK_PATH = os.path.abspath(os.sep)
+# Percent thresholds; None disables an alert. Memory and CPU use the 1-minute average.
+METRICS_ALERTS = {"battery_low": 20, "memory_high": 90, "cpu_high": None, "disk_high": 95}
+METRICS_ALERT_HYSTERESIS = 5
+# Calculator (calculator.py)
+CALC_CACHE_SIZE = 256  # compiled expressions kept
+CALC_PRECISION = 10  # significant digits spoken
+CALC_SPOKEN_DIGITS = 15  # longer whole numbers are spoken in scientific notation
+CALC_MAX_DIGITS = 1000  # powers with longer results are refused
+CALC_MAX_FACTORIAL = 1000
+CALC_RANGE_MAX_POINTS = 10 ** 7
+CALC_TABLE_ROWS = 20  # rows printed before the middle of a range table is elided
 LANGUAGE_CODE = 'en-US'
 VOICE_RATE = 170
-VOICE_ID = 'com.apple.speech.synthesis.voice.samantha'
\ No newline at end of file
+VOICE_ID = 'com.apple.speech.synthesis.voice.samantha'
+SPEECH_MAX_QUEUE = 50
+SPEECH_SPLIT_CHARS = 120
+SPEECH_COALESCE_CHARS = 400
+TTS_CACHE_ENABLED = True
+TTS_CACHE_DIR = os.path.join(base_dir, "tts_cache")
+TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024
+TTS_CACHE_MIN_REPEATS = 2
+TTS_CACHE_MAX_TRACKED = 500  # uncached phrases whose repeats are counted
+
+# Microphone capture (see audio_input.py)
+MIC_PREROLL_SECONDS = 0.5
+MIC_CALIBRATION_SECONDS = 0.5
+# Consecutive read errors before the microphone is closed; retries back off up to MIC_READ_BACKOFF_MAX seconds.
+MIC_MAX_READ_ERRORS = 10
+MIC_READ_BACKOFF_MAX = 2.0
+LISTEN_TIMEOUT = 5
+# Voice-activity endpointing (see vad.py): the utterance ends after VAD_MIN_HANGOVER
+# seconds of silence, growing towards VAD_MAX_HANGOVER for longer sentences.
+VAD_FRAME_MS = 20
+VAD_ENERGY_RATIO = 3.0
+VAD_MIN_HANGOVER = 0.25
+VAD_MAX_HANGOVER = 0.8
+# While the assistant is talking, a voice must be this many times above the echo of its own
+# playback (on top of VAD_ENERGY_RATIO) to count as the user barging in.
+BARGE_IN_RATIO = 2.0
+PHRASE_TIME_LIMIT = 10
+
+# Speech recognition (see recognition.py): "google", "vosk" or "sphinx".
+RECOGNIZER_BACKEND = "google"
+RECOGNIZER_FALLBACK = True
+RECOGNIZER_LANGUAGE = 'en-in'
+VOSK_MODEL_PATH = os.path.join(base_dir, "vosk-model")
+
+# Hands-free activation (see wakeword.py); needs the Vosk model above.
+WAKE_WORD_ENABLED = False
+WAKE_WORD = "jarvis"
@@ -0,0 +1,317 @@
+"""Full-text search inside documents under the home directory.
+
+Candidate files come from file_walker (so the same exclusion rules apply),
+known binary types are skipped by extension and everything else by sniffing
+its first bytes. Files are memory-mapped and scanned with a compiled regex in
+a long-lived process pool (spawned, so workers never inherit the assistant's
+threads), and hits stream back with their line for context.
+
+When CONTENT_INDEX_ENABLED is set, scanned text files are also stored in an
+SQLite FTS5 trigram index, capped at CONTENT_INDEX_MAX_TOTAL_BYTES. A query
+first scans the unchanged files the index says contain the keyword and stops
+there if they are enough. Otherwise the crawl only reads files that are new,
+changed or not indexed; unchanged indexed files are answered by the index.
+Files that have disappeared are dropped from the index as they are noticed.
+"""
+import atexit
+import contextlib
+import mmap
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import config
+import file_walker
+
+BINARY_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".heic", ".tiff", ".psd",
+    ".mp3", ".wav", ".aiff", ".flac", ".ogg", ".m4a", ".mp4", ".mov", ".avi", ".mkv", ".webm",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".dmg", ".iso", ".pkg", ".deb", ".rpm",
+    ".exe", ".dll", ".so", ".dylib", ".o", ".a", ".class", ".jar", ".pyc", ".whl",
+    ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".odt", ".key", ".pages", ".numbers",
+    ".db", ".sqlite", ".sqlite3", ".ttf", ".otf", ".woff", ".woff2",
+}
+BINARY_SIGNATURES = (b"%PDF", b"PK\x03\x04", b"\x89PNG", b"\xff\xd8\xff", b"GIF8", b"\x7fELF", b"MZ",
+                     b"\xcf\xfa\xed\xfe", b"\xca\xfe\xba\xbe", b"SQLite format 3")
+SNIFF_BYTES = 4096
+BATCH_SIZE = 32
+SCHEMA_VERSION = 2
+MIN_INDEXED_KEYWORD = 3  # trigram lookups need at least three characters
+
+
+def is_candidate_name(name):
+    return os.path.splitext(name)[1].lower() not in BINARY_EXTENSIONS
+
+
+def looks_binary(head):
+    """True if the first bytes of a file say it isn't text."""
+    return head.startswith(BINARY_SIGNATURES) or b"\x00" in head
+
+
+def _line_at(mm, position):
+    start = mm.rfind(b"\n", 0, position) + 1
+    end = mm.find(b"\n", position)
+    if end == -1:
+        end = len(mm)
+    line_number = mm[:start].count(b"\n") + 1
+    return line_number, mm[start:end].decode("utf-8", "replace").strip()[:200]
+
+
+def scan_file(path, pattern_bytes, max_hits=3, max_bytes=config.CONTENT_SEARCH_MAX_BYTES, want_text=False):
+    """Returns (path, mtime, [(line_number, line)], text or None) for one file; runs in a worker process."""
+    try:
+        stat = os.stat(path)
+        if stat.st_size == 0 or stat.st_size > max_bytes:
+            return path, stat.st_mtime, [], None
+        with open(path, "rb") as f:
+            if looks_binary(f.read(SNIFF_BYTES)):
+                return path, stat.st_mtime, [], None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pattern = re.compile(pattern_bytes, re.IGNORECASE)
+                hits = []
+                for match in pattern.finditer(mm):
+                    hits.append(_line_at(mm, match.start()))
+                    if len(hits) >= max_hits:
+                        break
+                text = None
+                if want_text and stat.st_size <= config.CONTENT_INDEX_MAX_FILE_BYTES:
+                    text = mm[:].decode("utf-8", "replace")
+                return path, stat.st_mtime, hits, text
+    except (OSError, ValueError):
+        return path, 0, [], None
+
+
+def scan_batch(paths, pattern_bytes, want_text):
+    return [scan_file(path, pattern_bytes, want_text=want_text) for path in paths]
+
+
+class ContentIndex:
+    """SQLite FTS5 trigram index of file contents, keyed by path and mtime and capped in total size."""
+
+    def __init__(self, db_path=config.CONTENT_INDEX_DB, max_total_bytes=config.CONTENT_INDEX_MAX_TOTAL_BYTES):
+        self.db_path = db_path
+        self.max_total_bytes = max_total_bytes
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # Older indexes used word tokens and kept no sizes; they are only a cache, so start over.
+                conn.execute("DROP TABLE IF EXISTS docs")
+                conn.execute("DROP TABLE IF EXISTS content")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("CREATE TABLE IF NOT EXISTS docs (path TEXT PRIMARY KEY, mtime REAL, size INTEGER, added REAL)")
+            self.substring = self._create_fts(conn)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _create_fts(conn):
+        """Creates the content table; True if it matches substrings (trigram tokenizer, SQLite 3.34+)."""
+        try:
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS content USING fts5(path UNINDEXED, body, "
+                         "tokenize='trigram')")
+            return True
+        except sqlite3.OperationalError:
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS content USING fts5(path UNINDEXED, body)")
+            return False
+
+    def can_answer(self, keyword):
+        """True if candidates(keyword) is exactly the indexed files containing keyword."""
+        return self.substring and len(keyword) >= MIN_INDEXED_KEYWORD
+
+    def candidates(self, keyword, limit=None):
+        """Paths whose indexed contents contain keyword (every word of it without the trigram tokenizer)."""
+        if self.can_answer(keyword):
+            query = '"' + keyword.replace('"', '""') + '"'
+        else:
+            words = re.findall(r"\w+", keyword.lower())
+            if not words:
+                return []
+            query = " ".join('"' + word + '"' for word in words)
+        with self._connect() as conn:
+            try:
+                return [row[0] for row in conn.execute(
+                    "SELECT path FROM content WHERE content MATCH ? LIMIT ?", (query, limit or -1))]
+            except sqlite3.OperationalError:
+                return []
+
+    def indexed_mtimes(self):
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT path, mtime FROM docs"))
+
+    def add(self, documents):
+        """Stores (path, mtime, text) tuples, replacing older versions of the same files."""
+        if not documents:
+            return
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            for path, mtime, text in documents:
+                conn.execute("DELETE FROM content WHERE path = ?", (path,))
+                conn.execute("INSERT INTO content (path, body) VALUES (?, ?)", (path, text))
+                conn.execute("INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?)", (path, mtime, len(text), now))
+            self._evict(conn)
+
+    def remove(self, paths):
+        """Drops the given files from the index, e.g. because they no longer exist."""
+        if not paths:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany("DELETE FROM content WHERE path = ?", [(path,) for path in paths])
+            conn.executemany("DELETE FROM docs WHERE path = ?", [(path,) for path in paths])
+
+    def _evict(self, conn):
+        """Removes the longest-indexed files until the indexed text fits in max_total_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM docs").fetchone()[0]
+        if total <= self.max_total_bytes:
+            return
+        evicted = []
+        for path, size in conn.execute("SELECT path, size FROM docs ORDER BY added"):
+            if total <= self.max_total_bytes:
+                break
+            evicted.append((path,))
+            total -= size or 0
+        conn.executemany("DELETE FROM content WHERE path = ?", evicted)
+        conn.executemany("DELETE FROM docs WHERE path = ?", evicted)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers=config.CONTENT_SEARCH_WORKERS):
+    """Returns the shared scanning pool, spawning its workers on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_pool.shutdown, wait=False)
+        return _pool
+
+
+def _discard_pool(pool):
+    """Forgets a pool whose workers died so the next search spawns a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _scan_paths(executor, paths, pattern_bytes, workers, index, indexed):
+    """Scans paths in batches on executor and yields each (path, mtime, hits, text) as batches finish."""
+    paths = iter(paths)
+    in_flight = set()
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < workers * 2:
+                batch = [path for _, path in zip(range(BATCH_SIZE), paths)]
+                if not batch:
+                    exhausted = True
+                    break
+                want_text = bool(index) and any(indexed.get(path) != _mtime(path) for path in batch)
+                in_flight.add(executor.submit(scan_batch, batch, pattern_bytes, want_text))
+            if not in_flight:
+                return
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                results = future.result()
+                if index:
+                    index.add([(path, mtime, text) for path, mtime, _, text in results
+                               if text is not None and indexed.get(path) != mtime])
+                for result in results:
+                    yield result
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def search_contents(keyword, root=None, limit=10, workers=config.CONTENT_SEARCH_WORKERS, index=None,
+                    executor=None):
+    """Yields (path, line_number, line) for text files under root containing keyword, as they are found."""
+    pattern_bytes = re.escape(keyword.encode("utf-8"))
+    root = root or os.path.expanduser("~")
+    indexed = index.indexed_mtimes() if index else {}
+    answered = index is not None and index.can_answer(keyword)
+    pool = executor or get_pool(workers)
+    reported = set()
+    found = 0
+
+    # Indexed files known to contain the keyword, unless they vanished or changed since they were indexed.
+    known, gone = set(), []
+    for path in index.candidates(keyword) if index else []:
+        mtime = _mtime(path)
+        if mtime is None:
+            gone.append(path)
+        elif mtime == indexed.get(path):
+            known.add(path)
+    if index:
+        index.remove(gone)
+
+    def unanswered(walker, walked):
+        # The crawl only hands on files the index can't vouch for: new, changed or never indexed.
+        for path in walker:
+            walked.add(path)
+            if path in known or (answered and indexed.get(path) == _mtime(path)):
+                continue
+            yield path
+
+    walked = set()
+    walker = file_walker.walk_files(root, is_candidate_name)
+    try:
+        for stage in (known, unanswered(walker, walked)):
+            for path, _, hits, _ in _scan_paths(pool, stage, pattern_bytes, workers, index, indexed):
+                if path in reported:
+                    continue
+                for line_number, line in hits:
+                    reported.add(path)
+                    found += 1
+                    yield path, line_number, line
+                    if found >= limit:
+                        return
+        if index:
+            # The crawl finished, so indexed files under root that it didn't meet are gone.
+            prefix = os.path.join(root, "")
+            index.remove([path for path in indexed if path.startswith(prefix) and path not in walked
+                          and path not in known])
+    except BrokenProcessPool:
+        if executor is None:
+            _discard_pool(pool)
+        raise
+    finally:
+        walker.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Returns the shared content index, or None when CONTENT_INDEX_ENABLED is off."""
+    global _index
+    if not config.CONTENT_INDEX_ENABLED:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = ContentIndex(config.CONTENT_INDEX_DB)
+        return _index
@@ -0,0 +1,128 @@
+"""Dry-run side-effect layer.
+
+While a DryRun is active, spoken output, browser opens, app launches and
+shutdown/restart commands are recorded instead of performed, so the command
+pipeline can be driven at full speed without audio or a desktop session.
+File deletions are recorded too, and every store under Jarvis_Data (to-dos,
+facts, notes, caches, indexes) is pointed at a scratch directory that is
+thrown away afterwards, so a replayed session leaves no trace in real data.
+"""
+import contextlib
+import os
+import subprocess
+import tempfile
+import time
+import webbrowser
+
+import commands
+import config
+import content_search
+import file_index
+import journal
+import memory_store
+import prefetch
+import response_cache
+import todo_store
+import voice
+
+# config paths of everything the assistant writes; redirected into the scratch directory.
+STORE_PATHS = ("TODO_FILE", "TODO_DB", "MEMORY_FILE", "NOTES_FILE", "FILE_INDEX_DB", "CONTENT_INDEX_DB",
+               "HTTP_CASSETTE_DIR", "RESPONSE_CACHE_DB", "PREFETCH_STATE_FILE", "TTS_CACHE_DIR")
+# Shared instances, reset so they are created again on the scratch paths.
+SINGLETONS = ((todo_store, "_store"), (memory_store, "_store"), (journal, "_journal"), (response_cache, "_cache"),
+              (prefetch, "_refresher"), (file_index, "_index"), (content_search, "_index"))
+
+
+@contextlib.contextmanager
+def patched(target, name, value):
+    """Temporarily replaces target.name with value."""
+    original = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, original)
+
+
+class _CompletedProcess:
+    returncode = 0
+    stdout = b""
+    stderr = b""
+    pid = 0
+
+    def poll(self):
+        return 0
+
+    def wait(self, timeout=None):
+        return 0
+
+    def communicate(self, input=None, timeout=None):
+        return b"", b""
+
+
+class DryRun:
+    """Context manager that records side effects as (timestamp, kind, detail) events."""
+
+    def __init__(self, echo=False):
+        self.echo = echo
+        self.events = []
+        self._stack = None
+
+    def record(self, kind, detail):
+        self.events.append((time.time(), kind, detail))
+        if self.echo:
+            print(f"[dry-run] {kind}: {detail}")
+
+    def count(self, kind):
+        return sum(1 for _, event_kind, _ in self.events if event_kind == kind)
+
+    def _say(self, text, *args, **kwargs):
+        self.record("say", text)
+
+    def _open_url(self, url, *args, **kwargs):
+        self.record("browser", url)
+        return True
+
+    def _run(self, args, *more, **kwargs):
+        self.record("subprocess", args if isinstance(args, str) else " ".join(args))
+        return _CompletedProcess()
+
+    def _popen(self, args, *more, **kwargs):
+        self.record("process", args if isinstance(args, str) else " ".join(args))
+        return _CompletedProcess()
+
+    def _system(self, command):
+        self.record("system", command)
+        return 0
+
+    def _remove(self, path, *args, **kwargs):
+        self.record("remove", path)
+
+    def _close_stores(self):
+        """Stops background work on the scratch stores before the scratch directory goes away."""
+        if memory_store._store is not None:
+            memory_store._store.close()
+        if file_index._index is not None:
+            file_index._index.stop()
+
+    def __enter__(self):
+        self._stack = contextlib.ExitStack()
+        scratch = self._stack.enter_context(tempfile.TemporaryDirectory(prefix="jarvis-dryrun-"))
+        for name in STORE_PATHS:
+            self._stack.enter_context(patched(config, name, os.path.join(scratch, os.path.basename(getattr(config, name)))))
+        for module, name in SINGLETONS:
+            self._stack.enter_context(patched(module, name, None))
+        self._stack.callback(self._close_stores)
+        self._stack.enter_context(patched(voice, "say", self._say))
+        self._stack.enter_context(patched(commands, "say", self._say))
+        self._stack.enter_context(patched(webbrowser, "open", self._open_url))
+        self._stack.enter_context(patched(subprocess, "run", self._run))
+        self._stack.enter_context(patched(subprocess, "Popen", self._popen))
+        self._stack.enter_context(patched(os, "system", self._system))
+        self._stack.enter_context(patched(os, "remove", self._remove))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+        return False
@@ -0,0 +1,247 @@
+"""Persistent filename index for search_local_files.
+
+A SQLite database in the Jarvis_Data directory holds every file name under
+the home directory. It is built once on a background thread and refreshed
+incrementally: a directory is only re-listed when its mtime has changed,
+which is exactly when entries were added, removed or renamed in it. Lookups
+use an FTS5 trigram index when SQLite supports it (3.34+), and results are
+ranked instead of being "whatever os.walk found first".
+"""
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+
+import config
+from file_walker import is_excluded_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, name TEXT NOT NULL, dir TEXT NOT NULL, mtime REAL);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime REAL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class FileIndex:
+    """SQLite-backed index of file names with mtime-driven incremental refresh."""
+
+    def __init__(self, db_path=config.FILE_INDEX_DB, root=os.path.expanduser("~"),
+                 refresh_seconds=config.FILE_INDEX_REFRESH_SECONDS):
+        self.db_path = db_path
+        self.root = root
+        self.refresh_seconds = refresh_seconds
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.building = False
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            self.has_trigram = self._create_fts(conn)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Yields a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _create_fts(conn):
+        try:
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(name, path UNINDEXED, tokenize='trigram')")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    # ---------- BUILDING ----------
+
+    def start(self):
+        """Builds or refreshes the index on a background thread, then keeps refreshing it periodically."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="FileIndex", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"File Index Error: {e}")
+            self._stop.wait(self.refresh_seconds)
+
+    def refresh(self):
+        """Re-lists directories whose mtime changed since the last scan; the first call indexes everything."""
+        with self._write_lock:
+            self.building = True
+            try:
+                with self._connect() as conn:
+                    known_dirs = dict(conn.execute("SELECT path, mtime FROM dirs"))
+                    if not known_dirs or self.last_refresh() is None:
+                        # First scan, or one that was interrupted: list everything, committing as it goes.
+                        self._scan_tree(conn, self.root)
+                        if self._stop.is_set():
+                            return
+                    else:
+                        for path, mtime in known_dirs.items():
+                            if self._stop.is_set():
+                                return
+                            try:
+                                current = os.stat(path).st_mtime
+                            except OSError:
+                                self._forget_tree(conn, path)
+                                continue
+                            if current != mtime:
+                                self._scan_dir(conn, path, walk_new=True)
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_refresh', ?)", (str(time.time()),))
+            finally:
+                self.building = False
+
+    def _scan_tree(self, conn, top):
+        """Scans top and everything below it, committing every FILE_INDEX_COMMIT_DIRS directories."""
+        pending = [top]
+        scanned = 0
+        while pending and not self._stop.is_set():
+            pending.extend(self._scan_dir(conn, pending.pop()))
+            scanned += 1
+            if scanned % config.FILE_INDEX_COMMIT_DIRS == 0:
+                conn.commit()
+
+    def _scan_dir(self, conn, path, walk_new=False):
+        """Brings the index rows for one directory up to date; returns its subdirectories that need scanning."""
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not is_excluded_dir(entry.name):
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append((entry.path, entry.name, path, entry.stat(follow_symlinks=False).st_mtime))
+                    except OSError:
+                        continue
+            dir_mtime = os.stat(path).st_mtime
+        except OSError:
+            self._forget_tree(conn, path)
+            return []
+
+        old_mtimes = dict(conn.execute("SELECT path, mtime FROM files WHERE dir = ?", (path,)))
+        new_paths = {row[0] for row in files}
+        removed = set(old_mtimes) - new_paths
+        added = [row for row in files if row[0] not in old_mtimes]
+        changed = [row for row in files if row[0] in old_mtimes and old_mtimes[row[0]] != row[3]]
+
+        conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+        conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", added + changed)
+        if self.has_trigram:
+            conn.executemany("DELETE FROM names WHERE path = ?", [(p,) for p in removed])
+            conn.executemany("INSERT INTO names (name, path) VALUES (?, ?)", [(row[1], row[0]) for row in added])
+        conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (path, dir_mtime))
+
+        known_subdirs = {row[0] for row in conn.execute(
+            "SELECT path FROM dirs WHERE path > ? AND path < ?", (path + os.sep, path + os.sep + "\uffff"))
+            if os.path.dirname(row[0]) == path}
+        for gone in known_subdirs - set(subdirs):
+            self._forget_tree(conn, gone)
+        if walk_new:
+            for subdir in subdirs:
+                if subdir not in known_subdirs:
+                    self._scan_tree(conn, subdir)
+            return []
+        return subdirs
+
+    def _forget_tree(self, conn, path):
+        prefix = (path + os.sep, path + os.sep + "\uffff")
+        if self.has_trigram:
+            conn.execute("DELETE FROM names WHERE path IN (SELECT path FROM files WHERE dir = ? OR (dir > ? AND dir < ?))",
+                         (path,) + prefix)
+        conn.execute("DELETE FROM files WHERE dir = ? OR (dir > ? AND dir < ?)", (path,) + prefix)
+        conn.execute("DELETE FROM dirs WHERE path = ? OR (path > ? AND path < ?)", (path,) + prefix)
+
+    # ---------- QUERIES ----------
+
+    def is_ready(self):
+        """True once a full scan has completed at least once."""
+        return self.last_refresh() is not None
+
+    def last_refresh(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'last_refresh'").fetchone()
+        return float(row[0]) if row else None
+
+    def search(self, keyword, limit=5, candidates=500):
+        """Returns up to limit paths whose file name contains keyword, best matches first."""
+        keyword = keyword.lower().strip()
+        if not keyword:
+            return []
+        with self._connect() as conn:
+            if self.has_trigram and len(keyword) >= 3:
+                query = '"' + keyword.replace('"', '""') + '"'
+                rows = conn.execute(
+                    "SELECT f.path, f.name, f.mtime FROM names JOIN files f ON f.path = names.path "
+                    "WHERE names MATCH ? LIMIT ?", (query, candidates)).fetchall()
+            else:
+                pattern = "%" + keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                rows = conn.execute("SELECT path, name, mtime FROM files WHERE name LIKE ? ESCAPE '\\' LIMIT ?",
+                                    (pattern, candidates)).fetchall()
+        rows.sort(key=lambda row: rank(keyword, row[0], row[1], row[2]))
+        return [row[0] for row in rows[:limit]]
+
+    def stats(self):
+        """Reports the index size and how stale it is."""
+        with self._connect() as conn:
+            files = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            dirs = conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0]
+        last = self.last_refresh()
+        size = sum(os.path.getsize(self.db_path + suffix) for suffix in ("", "-wal")
+                   if os.path.exists(self.db_path + suffix))
+        return {
+            "files": files,
+            "dirs": dirs,
+            "bytes": size,
+            "staleness_seconds": time.time() - last if last else None,
+            "building": self.building,
+            "trigram": self.has_trigram,
+        }
+
+
+def rank(keyword, path, name, mtime):
+    """Sort key: exact names first, then prefixes, then word matches, shallow and recent paths first."""
+    lowered = name.lower()
+    stem = os.path.splitext(lowered)[0]
+    if stem == keyword or lowered == keyword:
+        quality = 0
+    elif lowered.startswith(keyword):
+        quality = 1
+    elif any(part.startswith(keyword) for part in lowered.replace("-", " ").replace("_", " ").replace(".", " ").split()):
+        quality = 2
+    else:
+        quality = 3
+    return quality, path.count(os.sep), -(mtime or 0)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Returns the shared file index, starting its background builder on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FileIndex(config.FILE_INDEX_DB)
+            _index.start()
+        return _index
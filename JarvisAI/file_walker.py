@@ -0,0 +1,85 @@
+"""Parallel os.scandir directory crawler with streaming results.
+
+Used by search_local_files while the file index is not ready yet, and shares
+its exclusion rules with the index. Each directory is listed by a worker in a
+thread pool and its subdirectories are queued as new tasks, so slow subtrees
+don't hold up the rest. Matches are yielded as soon as they are found, and
+closing the generator stops the crawl.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+
+import config
+
+_DONE = object()
+
+
+def is_excluded_dir(name, excluded=None):
+    """True for directories the crawler and the file index skip (see SEARCH_EXCLUDED_DIRS)."""
+    if config.SEARCH_SKIP_HIDDEN and name.startswith('.'):
+        return True
+    return name.lower() in (excluded if excluded is not None else config.SEARCH_EXCLUDED_DIRS)
+
+
+def walk_files(root, match, workers=config.SEARCH_WALK_WORKERS, excluded=None):
+    """Yields paths of files under root for which match(file_name) is true, in discovery order."""
+    results = Queue()
+    stop = threading.Event()
+    pending = [1]
+    lock = threading.Lock()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file_walker")
+
+    def finish_task():
+        with lock:
+            pending[0] -= 1
+            if pending[0] == 0:
+                results.put(_DONE)
+
+    def scan(path):
+        try:
+            if stop.is_set():
+                return
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if stop.is_set():
+                        return
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not is_excluded_dir(entry.name, excluded):
+                                with lock:
+                                    pending[0] += 1
+                                executor.submit(scan, entry.path)
+                        elif match(entry.name):
+                            results.put(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        finally:
+            finish_task()
+
+    executor.submit(scan, root)
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        executor.shutdown(wait=False)
+
+
+def find_files(keyword, root=None, limit=5):
+    """Yields up to limit files under root (default: home) whose name contains keyword."""
+    keyword = keyword.lower()
+    walker = walk_files(root or os.path.expanduser("~"), lambda name: keyword in name.lower())
+    try:
+        for count, path in enumerate(walker, start=1):
+            yield path
+            if count >= limit:
+                return
+    finally:
+        walker.close()
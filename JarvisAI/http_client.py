@@ -0,0 +1,110 @@
+"""One pooled HTTP session for every network-backed command.
+
+Weather, news, jokes, Wikipedia and the UI's GIF download all share a
+requests.Session, so repeat calls reuse kept-alive connections instead of
+paying DNS, TCP and TLS setup each time. Idempotent requests are retried a
+bounded number of times with exponential backoff, timeouts are set per host
+(HTTP_HOST_TIMEOUTS), and every request's latency is recorded for stats().
+HTTP_BACKEND can swap the live APIs for recorded or stand-in responses
+(see http_standin.py).
+"""
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+import http_standin
+
+_session = None
+_session_lock = threading.Lock()
+_metrics = defaultdict(lambda: {"requests": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": None})
+_metrics_lock = threading.Lock()
+
+
+def get_session():
+    """Returns the shared session, creating its connection pools on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=config.HTTP_RETRIES, backoff_factor=config.HTTP_BACKOFF,
+                          status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET", "HEAD"),
+                          respect_retry_after_header=True, raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=config.HTTP_POOL_HOSTS, pool_maxsize=config.HTTP_POOL_SIZE,
+                                  max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = config.HTTP_USER_AGENT
+            _session = session
+        return _session
+
+
+def timeout_for(host):
+    """(connect, read) timeout in seconds for host."""
+    return config.HTTP_CONNECT_TIMEOUT, config.HTTP_HOST_TIMEOUTS.get(host, config.HTTP_READ_TIMEOUT)
+
+
+def _record(host, elapsed_ms, failed):
+    with _metrics_lock:
+        entry = _metrics[host]
+        entry["requests"] += 1
+        entry["errors"] += int(failed)
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["last_ms"] = elapsed_ms
+
+
+def get(url, **kwargs):
+    """requests.get through the shared session, with the host's timeout unless one is given."""
+    host = urlsplit(url).hostname or ""
+    kwargs.setdefault("timeout", timeout_for(host))
+    backend = config.HTTP_BACKEND
+    started = time.perf_counter()
+    failed = True
+    try:
+        if backend == "replay":
+            response = http_standin.replay(url, kwargs.get("params"))
+        elif backend == "standin":
+            response = get_session().get(http_standin.get_server().url_for(url), **kwargs)
+        else:
+            response = get_session().get(url, **kwargs)
+            if backend == "record":
+                http_standin.record(url, kwargs.get("params"), response)
+        failed = response.status_code >= 500
+        return response
+    finally:
+        _record(host, (time.perf_counter() - started) * 1000, failed)
+
+
+def get_json(url, **kwargs):
+    return get(url, **kwargs).json()
+
+
+def stats():
+    """Per-host request counts, errors and latency in milliseconds."""
+    with _metrics_lock:
+        return {host: dict(entry, mean_ms=entry["total_ms"] / entry["requests"] if entry["requests"] else None)
+                for host, entry in _metrics.items()}
+
+
+class _RequestsShim:
+    """Stands in for the requests module inside libraries that call requests.get directly."""
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    @staticmethod
+    def get(url, **kwargs):
+        return get(url, **kwargs)
+
+
+def install_wikipedia():
+    """Routes the wikipedia package's API calls through the shared session."""
+    import wikipedia.wikipedia
+    if not isinstance(wikipedia.wikipedia.requests, _RequestsShim):
+        wikipedia.wikipedia.requests = _RequestsShim()
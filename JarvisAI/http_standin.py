@@ -0,0 +1,286 @@
+"""Offline stand-ins for the weather, news, joke and Wikipedia APIs.
+
+Selected by config.HTTP_BACKEND and used by http_client.get:
+
+- "record": requests go to the real APIs and every response is saved as a
+  cassette (one JSON file per request) in HTTP_CASSETTE_DIR.
+- "replay": responses come only from cassettes; nothing touches the network
+  and an unrecorded request fails with a ConnectionError.
+- "standin": requests go to a local HTTP server that answers from cassettes
+  when one exists and otherwise with a synthetic payload of the right shape.
+  Latency, error rate and payload size are configurable (HTTP_STANDIN_*) and
+  the randomness is seeded, so caching, retries and concurrency can be
+  measured the same way on every run.
+
+Cassettes are keyed by host, path and query with the API keys left out, so
+recordings can be shared without leaking them. To serve a stand-in for other
+processes, run (from the JarvisAI directory):
+    python -m http_standin --port 8765
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep  # bound here so benchmarks that stub time.sleep keep the simulated latency
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import config
+
+SECRET_PARAMS = {"appid", "apikey", "api_key", "key"}
+
+
+# ---------- CASSETTES ----------
+
+def request_key(url, params=None):
+    """host + path + sorted query (including params) without secret parameters."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((name, str(value)) for name, value in dict(params).items())
+    query = sorted((name, value) for name, value in query if name.lower() not in SECRET_PARAMS)
+    return f"{parts.hostname}{parts.path}?{urlencode(query)}"
+
+
+def cassette_path(key, directory=None):
+    host = key.split("/", 1)[0]
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory or config.HTTP_CASSETTE_DIR, f"{host}_{digest}.json")
+
+
+def save_cassette(key, status, content_type, body, directory=None):
+    path = cassette_path(key, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "status": status, "content_type": content_type, "body": body}, f, indent=1)
+    os.replace(temp_path, path)
+
+
+def load_cassette(key, directory=None):
+    """Returns the recorded {"status", "content_type", "body"} for key, or None."""
+    try:
+        with open(cassette_path(key, directory), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return None
+
+
+def record(url, params, response):
+    """Saves a live requests.Response as the cassette for (url, params)."""
+    if response.status_code >= 500:
+        return
+    try:
+        save_cassette(request_key(url, params), response.status_code,
+                      response.headers.get("Content-Type", "application/json"), response.text)
+    except (IOError, OSError) as e:
+        print(f"Cassette Error: {e}")
+
+
+def replay(url, params=None):
+    """Returns a requests.Response built from the cassette for (url, params)."""
+    import requests
+
+    key = request_key(url, params)
+    cassette = load_cassette(key)
+    if cassette is None:
+        raise requests.ConnectionError(f"No recorded response for {key}")
+    response = requests.Response()
+    response.status_code = cassette["status"]
+    response.headers["Content-Type"] = cassette["content_type"]
+    response._content = cassette["body"].encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+
+# ---------- SYNTHETIC PAYLOADS ----------
+
+def _filler(size, rng):
+    words = ["alpha", "bravo", "delta", "harbor", "signal", "market", "river", "summit", "orbit", "lantern"]
+    text = []
+    while sum(len(word) + 1 for word in text) < size:
+        text.append(rng.choice(words))
+    return " ".join(text)
+
+
+def synthetic_weather(query, rng, size):
+    city = query.get("q", "Delhi")
+    return {"cod": 200, "name": city.title(),
+            "main": {"temp": round(rng.uniform(-5, 40), 1), "humidity": rng.randint(10, 95)},
+            "weather": [{"description": rng.choice(["clear sky", "few clouds", "light rain", "haze"])}],
+            "wind": {"speed": round(rng.uniform(0, 12), 1)}}
+
+
+def synthetic_news(query, rng, size):
+    count = max(5, size // 400)
+    return {"status": "ok", "totalResults": count,
+            "articles": [{"title": f"Headline {i}: {_filler(60, rng)}", "description": _filler(300, rng)}
+                         for i in range(1, count + 1)]}
+
+
+def synthetic_jokes(query, rng, size):
+    amount = int(query.get("amount", 1))
+    jokes = [{"type": "single", "joke": f"Stand-in joke {i}. {_filler(40, rng)}"} if i % 2 else
+             {"type": "twopart", "setup": f"Stand-in setup {i}?", "delivery": _filler(30, rng)}
+             for i in range(1, amount + 1)]
+    return {"error": False, "amount": amount, "jokes": jokes} if amount > 1 else jokes[0]
+
+
+def synthetic_wikipedia(query, rng, size):
+    """Enough of the MediaWiki API for wikipedia.summary(): search, page info and extracts."""
+    if query.get("list") == "search":
+        return {"query": {"search": [{"title": query.get("srsearch", "Stand-in").title()}], "searchinfo": {}}}
+    title = query.get("titles", "Stand-in")
+    page = {"pageid": 1, "ns": 0, "title": title, "fullurl": f"https://en.wikipedia.org/wiki/{title}"}
+    if "extracts" in query.get("prop", ""):
+        page["extract"] = f"{title} is a stand-in article. " + _filler(size, rng) + "."
+    return {"query": {"pages": {"1": page}}}
+
+
+SYNTHETIC = {
+    "api.openweathermap.org": synthetic_weather,
+    "newsapi.org": synthetic_news,
+    "v2.jokeapi.dev": synthetic_jokes,
+    "en.wikipedia.org": synthetic_wikipedia,
+}
+
+
+# ---------- STAND-IN SERVER ----------
+
+class StandinServer:
+    """Local HTTP server that answers for the APIs at http://127.0.0.1:<port>/<host>/<path>."""
+
+    def __init__(self, port=config.HTTP_STANDIN_PORT, latency_ms=config.HTTP_STANDIN_LATENCY_MS,
+                 jitter_ms=config.HTTP_STANDIN_JITTER_MS, error_rate=config.HTTP_STANDIN_ERROR_RATE,
+                 payload_bytes=config.HTTP_STANDIN_PAYLOAD_BYTES, seed=config.HTTP_STANDIN_SEED,
+                 cassette_dir=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.payload_bytes = payload_bytes
+        self.cassette_dir = cassette_dir or config.HTTP_CASSETTE_DIR
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "errors_injected": 0, "from_cassette": 0, "synthetic": 0, "unknown": 0}
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    def url_for(self, url):
+        """Rewrites a real API URL to the same request against this server."""
+        parts = urlsplit(url)
+        rewritten = f"http://127.0.0.1:{self.port}/{parts.hostname}{parts.path}"
+        return rewritten + (f"?{parts.query}" if parts.query else "")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="HttpStandin", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _draw(self):
+        """Draws (delay in seconds, inject an error?, payload generator) from the seeded generator."""
+        with self._lock:
+            self.counts["requests"] += 1
+            delay = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000.0
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.counts["errors_injected"] += 1
+            return delay, failed, random.Random(self._rng.random())
+
+    def respond(self, host, path_and_query):
+        """Returns (status, content type, body) for a request to host."""
+        delay, failed, rng = self._draw()
+        sleep(delay)
+        if failed:
+            return 503, "application/json", json.dumps({"message": "stand-in injected error"})
+
+        key = request_key(f"http://{host}{path_and_query}")
+        cassette = load_cassette(key, self.cassette_dir)
+        if cassette is not None:
+            with self._lock:
+                self.counts["from_cassette"] += 1
+            return cassette["status"], cassette["content_type"], cassette["body"]
+
+        build = SYNTHETIC.get(host)
+        if build is None:
+            with self._lock:
+                self.counts["unknown"] += 1
+            return 404, "application/json", json.dumps({"message": f"stand-in has nothing for {host}"})
+        with self._lock:
+            self.counts["synthetic"] += 1
+        query = dict(parse_qsl(urlsplit(path_and_query).query, keep_blank_values=True))
+        return 200, "application/json", json.dumps(build(query, rng, self.payload_bytes))
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                host, _, rest = self.path.lstrip("/").partition("/")
+                status, content_type, body = server.respond(host, "/" + rest)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_server():
+    """Returns the shared stand-in server, started on first use."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = StandinServer().start()
+        return _server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the API stand-in until interrupted.")
+    parser.add_argument("--port", type=int, default=config.HTTP_STANDIN_PORT or 8765)
+    parser.add_argument("--latency-ms", type=float, default=config.HTTP_STANDIN_LATENCY_MS)
+    parser.add_argument("--jitter-ms", type=float, default=config.HTTP_STANDIN_JITTER_MS)
+    parser.add_argument("--error-rate", type=float, default=config.HTTP_STANDIN_ERROR_RATE)
+    parser.add_argument("--payload-bytes", type=int, default=config.HTTP_STANDIN_PAYLOAD_BYTES)
+    parser.add_argument("--seed", type=int, default=config.HTTP_STANDIN_SEED)
+    args = parser.parse_args(argv)
+
+    server = StandinServer(args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.payload_bytes,
+                           args.seed)
+    print(f"Stand-in serving on http://127.0.0.1:{server.port}/<host>/<path>")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        print(json.dumps(server.counts))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+"""Searchable notes journal behind create_note.
+
+Entries are still appended to assistant_notes.txt in the same
+"--- timestamp ---" blocks. A sidecar SQLite index (assistant_notes.idx)
+records each entry's byte offset, length and date, plus an inverted index from
+words to entries. The index only ever parses the bytes appended since it last
+looked, so opening it after years of journaling costs nothing extra, and
+matched entries are read back through mmap slices rather than by loading the
+whole journal.
+"""
+import contextlib
+import datetime
+import mmap
+import os
+import re
+import sqlite3
+import threading
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (id INTEGER PRIMARY KEY, offset INTEGER NOT NULL, length INTEGER NOT NULL,
+                                    stamp TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS entries_stamp ON entries (stamp);
+CREATE TABLE IF NOT EXISTS postings (word TEXT NOT NULL, entry INTEGER NOT NULL, PRIMARY KEY (word, entry)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+HEADER = re.compile(rb"\n--- (\d{4}-\d\d-\d\d) (\d\d:\d\d:\d\d) ---\n")
+STOP_WORDS = {"the", "a", "an", "and", "or", "to", "of", "in", "on", "at", "for", "is", "it", "that", "this", "i",
+              "my", "me", "was", "be", "with", "about"}
+
+
+def words_in(text):
+    """The distinct index terms of text."""
+    return {word for word in re.findall(r"[a-z0-9']+", text.lower()) if word not in STOP_WORDS}
+
+
+class Journal:
+    """Append-only notes file with an incrementally maintained offset and word index."""
+
+    def __init__(self, path=config.NOTES_FILE, index_path=None):
+        self.path = path
+        self.index_path = index_path or os.path.splitext(path)[0] + ".idx"
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Yields a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---------- WRITING ----------
+
+    def add(self, text, when=None):
+        """Appends an entry to the journal and indexes it; returns its timestamp."""
+        stamp = (when or datetime.datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            with open(self.path, "ab") as f:
+                f.write(f"\n--- {stamp} ---\n{text}\n".encode("utf-8"))
+            # The note is safely in the journal now; a broken index only costs searchability until it recovers.
+            try:
+                self._catch_up()
+            except (OSError, ValueError, sqlite3.Error) as e:
+                print(f"Journal Index Error: {e}")
+        return stamp
+
+    def _catch_up(self):
+        """Indexes whatever was appended to the journal since the last call, by any writer."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'indexed_bytes'").fetchone()
+            indexed = int(row[0]) if row else 0
+            if size == indexed:
+                return
+            if size < indexed:
+                # The journal was edited or truncated by hand; start over.
+                conn.execute("DELETE FROM entries")
+                conn.execute("DELETE FROM postings")
+                indexed = 0
+            if size == 0:
+                # Deleted or emptied: nothing to open (mmap refuses empty files), just record the reset.
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('indexed_bytes', '0')")
+                return
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Back up one byte so the newline that starts the next header is seen.
+                headers = list(HEADER.finditer(mm, max(indexed - 1, 0), size))
+                for position, match in enumerate(headers):
+                    end = headers[position + 1].start() if position + 1 < len(headers) else size
+                    body = mm[match.end():end].decode("utf-8", "replace")
+                    entry = conn.execute(
+                        "INSERT INTO entries (offset, length, stamp) VALUES (?, ?, ?)",
+                        (match.end(), end - match.end(), match.group(1).decode() + " " + match.group(2).decode())
+                    ).lastrowid
+                    conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)",
+                                     [(word, entry) for word in words_in(body)])
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('indexed_bytes', ?)", (str(size),))
+
+    # ---------- QUERIES ----------
+
+    def search(self, keywords="", start=None, end=None, limit=5):
+        """Returns [(timestamp, text)] of the newest entries containing every keyword within [start, end]."""
+        with self._lock:
+            self._catch_up()
+        terms = sorted(words_in(keywords))
+        clauses, params = [], []
+        if terms:
+            clauses.append("id IN (SELECT entry FROM postings WHERE word IN ({}) GROUP BY entry "
+                           "HAVING COUNT(*) = ?)".format(", ".join("?" * len(terms))))
+            params.extend(terms + [len(terms)])
+        if start:
+            clauses.append("stamp >= ?")
+            params.append(start.isoformat())
+        if end:
+            clauses.append("stamp < ?")
+            params.append((end + datetime.timedelta(days=1)).isoformat())
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT offset, length, stamp FROM entries {where} ORDER BY stamp DESC LIMIT ?",
+                                params + [limit]).fetchall()
+        if not rows:
+            return []
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [(stamp, mm[offset:offset + length].decode("utf-8", "replace").strip())
+                    for offset, length, stamp in rows]
+
+    def count(self):
+        with self._lock:
+            self._catch_up()
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def date_range(query, today=None):
+    """Reads "today", "yesterday", "this/last week", "this/last month" or "last N days" from a query."""
+    today = today or datetime.date.today()
+    if "yesterday" in query:
+        day = today - datetime.timedelta(days=1)
+        return day, day
+    if "today" in query:
+        return today, today
+    match = re.search(r"\b(?:last|past) (\d+) days\b", query)
+    if match:
+        return today - datetime.timedelta(days=int(match.group(1))), today
+    week_start = today - datetime.timedelta(days=today.weekday())
+    if "last week" in query:
+        return week_start - datetime.timedelta(days=7), week_start - datetime.timedelta(days=1)
+    if "this week" in query:
+        return week_start, today
+    month_start = today.replace(day=1)
+    if "last month" in query:
+        previous_end = month_start - datetime.timedelta(days=1)
+        return previous_end.replace(day=1), previous_end
+    if "this month" in query:
+        return month_start, today
+    return None, None
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    """Returns the shared notes journal."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = Journal(config.NOTES_FILE)
+        return _journal
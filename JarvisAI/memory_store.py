@@ -0,0 +1,257 @@
+"""In-process store for the facts behind remember/recall/forget.
+
+The facts are loaded once and served from a dict. Each change is appended to
+a small journal next to assistant_memory.json, so a write costs one short
+line instead of rewriting the whole file. Once the journal grows past
+MEMORY_COMPACT_EVERY entries, a background thread folds it back into
+assistant_memory.json with an atomic replace; this also happens at exit. An
+existing assistant_memory.json is simply the first snapshot, so nothing needs
+migrating.
+
+Keys are looked up through a trigram index, so "favourite colour" still finds
+favorite_color and a misheard word costs confidence instead of a miss.
+"""
+import atexit
+import difflib
+import json
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+
+import config
+
+# Words that frame a fact rather than name it; stripped from the ends of a key phrase.
+FILLER_WORDS = {"remember", "that", "save", "this", "fact", "forget", "about", "delete", "clear", "what", "where",
+                "who", "is", "are", "was", "tell", "me", "my", "your", "the", "a", "an", "please", "do", "you", "know",
+                "can", "could", "hey", "um", "uh", "jarvis"}
+SHORT_KEY_LENGTH = 6
+SPELLING_MATCH_MIN = 0.75
+
+
+def fact_key(phrase):
+    """Turns "can you remember that my favorite color" into "favorite_color"."""
+    words = re.findall(r"[a-z0-9']+", phrase.lower())
+    # Facts are always "your X", so whatever follows the last "my"/"your" names it.
+    for position in range(len(words) - 2, -1, -1):
+        if words[position] in ("my", "your"):
+            words = words[position + 1:]
+            break
+    while words and words[0] in FILLER_WORDS:
+        words.pop(0)
+    while words and words[-1] in FILLER_WORDS:
+        words.pop()
+    return "_".join(words)
+
+
+class KeyIndex:
+    """Trigram index over fact keys; scores candidates by Dice similarity."""
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._grams = {}
+        self._by_length = defaultdict(set)
+
+    @staticmethod
+    def trigrams(key):
+        text = " " + key.replace("_", " ") + " "
+        return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+    def add(self, key):
+        grams = self.trigrams(key)
+        self._grams[key] = grams
+        self._by_length[len(key)].add(key)
+        for gram in grams:
+            self._postings[gram].add(key)
+
+    def remove(self, key):
+        for gram in self._grams.pop(key, ()):
+            self._postings[gram].discard(key)
+        self._by_length[len(key)].discard(key)
+
+    def best(self, key, threshold):
+        """Returns (stored_key, confidence) for the closest stored key, or (None, 0.0)."""
+        grams = self.trigrams(key)
+        # A key scoring >= threshold shares at least `needed` trigrams with the query, so it must
+        # appear in one of the rarest len - needed + 1 posting lists; the common ones are never walked.
+        needed = max(1, int(math.ceil(threshold * len(grams) / 2.0)))
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        candidates = set().union(*postings[:len(postings) - needed + 1])
+        best_key, best_score = None, 0.0
+        for candidate in candidates:
+            other = self._grams[candidate]
+            score = 2.0 * len(grams & other) / (len(grams) + len(other))
+            if score > best_score:
+                best_key, best_score = candidate, score
+        if best_score < threshold and len(key) <= SHORT_KEY_LENGTH:
+            # Too few trigrams in a short word for a typo to leave any overlap; compare spellings instead.
+            for length in range(len(key) - 1, len(key) + 2):
+                for candidate in self._by_length.get(length, ()):
+                    score = difflib.SequenceMatcher(None, key, candidate).ratio()
+                    if score > best_score and score >= SPELLING_MATCH_MIN:
+                        best_key, best_score = candidate, score
+        return best_key, best_score
+
+
+class MemoryStore:
+    """Thread-safe dict of facts backed by a JSON snapshot plus an append-only journal."""
+
+    def __init__(self, path=config.MEMORY_FILE, compact_every=config.MEMORY_COMPACT_EVERY):
+        self.path = path
+        self.journal_path = os.path.splitext(path)[0] + ".journal"
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._facts = self._load_snapshot()
+        self._journal_entries = self._replay_journal()
+        self._index = KeyIndex()
+        for key in self._facts:
+            self._index.add(key)
+        self._journal = None
+        self._compacting = False
+
+    # ---------- LOADING ----------
+
+    def _load_snapshot(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                text = f.read()
+            return json.loads(text) if text.strip() else {}
+        except (json.JSONDecodeError, IOError):
+            print("Warning: Could not load or parse memory file.")
+            return {}
+
+    def _replay_journal(self):
+        """Applies journal entries written since the last compaction; a torn last line is cut off."""
+        if not os.path.exists(self.journal_path):
+            return 0
+        entries = 0
+        complete = 0
+        with open(self.journal_path, 'rb+') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A write interrupted by a crash; drop it so the next entry starts on a fresh line.
+                    f.truncate(complete)
+                    break
+                complete += len(line)
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if entry.get("op") == "set":
+                    self._facts[entry["key"]] = entry["value"]
+                else:
+                    self._facts.pop(entry["key"], None)
+                entries += 1
+        return entries
+
+    # ---------- READS ----------
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._facts.get(key, default)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._facts
+
+    def __len__(self):
+        with self._lock:
+            return len(self._facts)
+
+    def find(self, phrase, threshold=config.MEMORY_MATCH_THRESHOLD):
+        """Returns (key, value, confidence) for the fact phrase most likely refers to, or None."""
+        key = fact_key(phrase)
+        if not key:
+            return None
+        with self._lock:
+            if key in self._facts:
+                return key, self._facts[key], 1.0
+            match, confidence = self._index.best(key, threshold)
+            if match is None or confidence < threshold:
+                return None
+            return match, self._facts[match], confidence
+
+    def items(self):
+        """Returns a snapshot of the stored (key, value) pairs."""
+        with self._lock:
+            return list(self._facts.items())
+
+    # ---------- WRITES ----------
+
+    def set(self, key, value):
+        with self._lock:
+            if key not in self._facts:
+                self._index.add(key)
+            self._facts[key] = value
+            self._append({"op": "set", "key": key, "value": value})
+
+    def delete(self, key):
+        """Removes key and returns its value, or None if it wasn't stored."""
+        with self._lock:
+            if key not in self._facts:
+                return None
+            value = self._facts.pop(key)
+            self._index.remove(key)
+            self._append({"op": "del", "key": key})
+            return value
+
+    def _append(self, entry):
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a')
+            self._journal.write(json.dumps(entry) + "\n")
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        except (IOError, OSError):
+            print("Error: Could not save memory file.")
+            return
+        self._journal_entries += 1
+        if self._journal_entries >= self.compact_every and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self.compact, name="MemoryCompaction", daemon=True).start()
+
+    def compact(self):
+        """Writes the facts to a fresh snapshot, atomically replaces the old one and empties the journal."""
+        with self._lock:
+            try:
+                if self._journal_entries == 0:
+                    return
+                temp_path = self.path + ".tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(self._facts, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                os.remove(self.journal_path)
+                self._journal_entries = 0
+            except (IOError, OSError) as e:
+                print(f"Memory Compaction Error: {e}")
+            finally:
+                self._compacting = False
+
+    def close(self):
+        self.compact()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Returns the shared memory store, loading it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MemoryStore(config.MEMORY_FILE)
+            atexit.register(_store.close)
+        return _store
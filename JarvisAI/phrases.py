@@ -0,0 +1,27 @@
+"""Fixed responses spoken by more than one place or pre-rendered by tts_cache.
+
+Keeping them here means the text spoken and the text cached cannot drift apart.
+"""
+
+GREETING = "Hello Parth! Your modular voice assistant is ready."
+GOODBYE = "Goodbye Parth, take care!"
+GOODBYE_UI = "Goodbye Parth, closing the assistant."
+NOT_UNDERSTOOD = "Sorry, I didn't catch that. Please repeat."
+SPEECH_SERVICE_DOWN = "Speech service unavailable. Please check your internet connection."
+INTERNAL_ERROR = "I encountered an internal error while processing that command."
+TODO_EMPTY_OFFER = "Your to-do list is empty. Do you want to add a task?"
+TODO_EMPTY = "Your to-do list is empty."
+TODO_CLEARED = "Your to-do list has been cleared."
+TODO_ALREADY_EMPTY = "Your to-do list is already empty."
+TODO_HEADER = "Here are your current tasks:"
+ASK_TASK = "What task would you like to add?"
+ASK_WIKIPEDIA_TOPIC = "What would you like me to search on Wikipedia?"
+ASK_KEYWORD = "Please provide a keyword to search for."
+WEATHER_FAILED = "Couldn't fetch the weather."
+NEWS_FAILED = "Sorry, I couldn't fetch the latest news."
+NEWS_DONE = "That's all the latest news for now."
+WIKIPEDIA_FAILED = "An error occurred while searching Wikipedia."
+JOKE_FAILED = "Sorry, I can't think of a joke right now."
+CALCULATION_FAILED = "Sorry, I couldn't calculate that."
+OPENING_GOOGLE = "I'll open Google for you."
+CLIPBOARD_EMPTY = "Your clipboard is currently empty."
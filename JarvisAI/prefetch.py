@@ -0,0 +1,184 @@
+"""Background refresher for the most-used network answers.
+
+News headlines and the weather for the default city plus the most-asked
+cities are fetched on a schedule by one daemon thread, so get_news and
+get_weather can answer from a snapshot the moment the intent is recognized.
+Intervals are jittered so refreshes don't line up. A failing job backs off
+exponentially, up to PREFETCH_MAX_BACKOFF, and keeps serving its last good
+snapshot meanwhile.
+"""
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+
+import config
+
+
+class Snapshot:
+    def __init__(self, value, fetched_at=None):
+        self.value = value
+        self.fetched_at = fetched_at or time.time()
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def describe_age(self):
+        minutes = int(self.age // 60)
+        if minutes < 1:
+            return "just now"
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+
+
+class Job:
+    def __init__(self, key, fetch, interval):
+        self.key = key
+        self.fetch = fetch
+        self.interval = interval
+        self.failures = 0
+        self.next_run = 0.0
+        self.last_error = None
+
+
+class Refresher:
+    """Runs fetch jobs on jittered schedules and keeps the latest good result of each."""
+
+    def __init__(self, state_path=config.PREFETCH_STATE_FILE, jitter=config.PREFETCH_JITTER,
+                 max_backoff=config.PREFETCH_MAX_BACKOFF):
+        self.state_path = state_path
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self._jobs = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.city_usage = self._load_usage()
+
+    # ---------- JOBS ----------
+
+    def add_job(self, key, fetch, interval):
+        """Schedules fetch() every interval seconds under key; a job that already exists is left alone."""
+        with self._lock:
+            if key in self._jobs:
+                return
+            self._jobs[key] = Job(key, fetch, interval)
+        self._wake.set()
+
+    def remove_job(self, key):
+        with self._lock:
+            self._jobs.pop(key, None)
+
+    def job_keys(self, kind):
+        """Keys of the scheduled jobs of one kind, e.g. ("weather", city) for kind "weather"."""
+        with self._lock:
+            return [key for key in self._jobs if isinstance(key, tuple) and key[0] == kind]
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="Prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Cleared before the jobs are looked at, so an add_job from here on wakes the next wait.
+            self._wake.clear()
+            now = time.time()
+            with self._lock:
+                due = [job for job in self._jobs.values() if job.next_run <= now]
+            for job in due:
+                if self._stop.is_set():
+                    return
+                self._run_job(job)
+            with self._lock:
+                next_run = min((job.next_run for job in self._jobs.values()), default=now + 60)
+            self._wake.wait(max(0.0, next_run - time.time()))
+
+    def _run_job(self, job):
+        try:
+            value = job.fetch()
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            delay = min(self.max_backoff, job.interval * 2 ** (job.failures - 1))
+            job.next_run = time.time() + delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            print(f"Prefetch Error ({job.key}): {e}; retrying in {delay:.0f}s")
+            return
+        job.failures = 0
+        job.last_error = None
+        job.next_run = time.time() + job.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self.store(job.key, value)
+
+    # ---------- SNAPSHOTS ----------
+
+    def store(self, key, value):
+        with self._lock:
+            self._snapshots[key] = Snapshot(value)
+
+    def snapshot(self, key, max_age=config.PREFETCH_MAX_AGE):
+        """Returns the latest snapshot for key if it is younger than max_age, else None."""
+        with self._lock:
+            snap = self._snapshots.get(key)
+        return snap if snap is not None and snap.age <= max_age else None
+
+    def stats(self):
+        with self._lock:
+            return {str(key): {"age": self._snapshots[key].age if key in self._snapshots else None,
+                               "failures": job.failures, "last_error": job.last_error,
+                               "next_run_in": job.next_run - time.time()}
+                    for key, job in self._jobs.items()}
+
+    # ---------- CITY USAGE ----------
+
+    def _load_usage(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return Counter()
+        try:
+            with open(self.state_path, 'r') as f:
+                return Counter(json.load(f).get("city_usage", {}))
+        except (json.JSONDecodeError, IOError, AttributeError):
+            return Counter()
+
+    def note_city(self, city):
+        """Counts a weather request for city; returns the cities worth keeping warm."""
+        city = city.lower()
+        with self._lock:
+            self.city_usage[city] += 1
+            usage = dict(self.city_usage)
+        if self.state_path:
+            try:
+                temp_path = self.state_path + ".tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump({"city_usage": usage}, f)
+                os.replace(temp_path, self.state_path)
+            except (IOError, OSError) as e:
+                print(f"Prefetch State Error: {e}")
+        return self.top_cities()
+
+    def top_cities(self):
+        with self._lock:
+            ranked = [city for city, _ in self.city_usage.most_common(config.PREFETCH_WEATHER_CITIES)]
+        default = config.DEFAULT_CITY.lower()
+        return [default] + [city for city in ranked if city != default][:config.PREFETCH_WEATHER_CITIES - 1]
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_refresher():
+    """Returns the shared refresher (not started; see commands.start_prefetch)."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = Refresher(config.PREFETCH_STATE_FILE)
+        return _refresher
@@ -0,0 +1,203 @@
+"""Speech-recognition backends for voice.listen().
+
+config.RECOGNIZER_BACKEND picks the primary engine ("google", "vosk" or
+"sphinx"). Offline engines load their models once and stay warm; if one
+cannot start, or config.RECOGNIZER_FALLBACK is set and it fails on an
+utterance, the cloud recognizer is tried instead.
+"""
+import json
+import os
+import threading
+
+import speech_recognition as sr
+
+import config
+
+
+class RecognizerBackend:
+    """Turns sr.AudioData into text. Raises sr.UnknownValueError or sr.RequestError like speech_recognition."""
+
+    name = "base"
+    supports_partials = False
+
+    def recognize(self, audio):
+        raise NotImplementedError
+
+    def start_stream(self, sample_rate, on_partial=None):
+        """Returns a stream that is fed raw chunks while the user speaks; see RecognitionStream."""
+        return RecognitionStream(self)
+
+
+class RecognitionStream:
+    """Default stream for engines without partial results: ignores chunks, recognizes the whole phrase."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def feed(self, buffer):
+        pass
+
+    def finish(self, audio):
+        return self.backend.recognize(audio)
+
+
+class VoskStream(RecognitionStream):
+    """Feeds chunks to a Kaldi recognizer as they arrive and reports partial transcripts."""
+
+    def __init__(self, backend, recognizer, on_partial):
+        super().__init__(backend)
+        self.recognizer = recognizer
+        self.on_partial = on_partial
+        self.segments = []
+        self.last_partial = ""
+
+    def feed(self, buffer):
+        if self.recognizer.AcceptWaveform(buffer):
+            segment = json.loads(self.recognizer.Result()).get("text", "")
+            if segment:
+                self.segments.append(segment)
+            partial = ""
+        else:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        hypothesis = " ".join(self.segments + [partial]).strip()
+        if self.on_partial and hypothesis and hypothesis != self.last_partial:
+            self.last_partial = hypothesis
+            self.on_partial(hypothesis)
+
+    def finish(self, audio):
+        final = json.loads(self.recognizer.FinalResult()).get("text", "")
+        text = " ".join(self.segments + [final]).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class GoogleBackend(RecognizerBackend):
+    name = "google"
+
+    def __init__(self, language=config.RECOGNIZER_LANGUAGE):
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio):
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+_vosk_models = {}
+_vosk_lock = threading.Lock()
+
+
+def load_vosk_model(model_path=config.VOSK_MODEL_PATH):
+    """Returns (vosk module, model), loading each model directory only once per process."""
+    try:
+        import vosk
+    except ImportError:
+        raise RuntimeError("The vosk package is required for offline recognition: pip install vosk")
+    if not model_path or not os.path.isdir(model_path):
+        raise RuntimeError("Set VOSK_MODEL_PATH in config.py to a downloaded Vosk model directory.")
+    with _vosk_lock:
+        if model_path not in _vosk_models:
+            vosk.SetLogLevel(-1)
+            _vosk_models[model_path] = vosk.Model(model_path)
+        return vosk, _vosk_models[model_path]
+
+
+class VoskBackend(RecognizerBackend):
+    """Offline Kaldi recognizer; the model is loaded once and reused for every utterance."""
+
+    name = "vosk"
+    sample_rate = 16000
+    supports_partials = True
+
+    def __init__(self, model_path=config.VOSK_MODEL_PATH):
+        self.vosk, self.model = load_vosk_model(model_path)
+
+    def new_recognizer(self, sample_rate=sample_rate):
+        return self.vosk.KaldiRecognizer(self.model, sample_rate)
+
+    def start_stream(self, sample_rate, on_partial=None):
+        return VoskStream(self, self.new_recognizer(sample_rate), on_partial)
+
+    def recognize(self, audio):
+        recognizer = self.new_recognizer()
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "")
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class SphinxBackend(RecognizerBackend):
+    """Offline PocketSphinx recognizer through speech_recognition."""
+
+    name = "sphinx"
+
+    def __init__(self):
+        try:
+            import pocketsphinx  # noqa: F401
+        except ImportError:
+            raise RuntimeError("The pocketsphinx package is required for offline recognition: pip install pocketsphinx")
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio):
+        return self.recognizer.recognize_sphinx(audio)
+
+
+class FallbackBackend(RecognizerBackend):
+    """Tries the primary engine first and the cloud engine when it fails."""
+
+    def __init__(self, primary, fallback):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+        self.supports_partials = primary.supports_partials
+
+    def recognize(self, audio):
+        return self._finish(self.primary.recognize, audio)
+
+    def start_stream(self, sample_rate, on_partial=None):
+        stream = self.primary.start_stream(sample_rate, on_partial)
+        stream.finish = lambda audio, primary_finish=stream.finish: self._finish(primary_finish, audio)
+        return stream
+
+    def _finish(self, primary_recognize, audio):
+        try:
+            return primary_recognize(audio)
+        except (sr.UnknownValueError, sr.RequestError) as e:
+            print(f"{self.primary.name} recognition failed ({type(e).__name__}); trying {self.fallback.name}.")
+            return self.fallback.recognize(audio)
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "vosk": VoskBackend,
+    "sphinx": SphinxBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name=config.RECOGNIZER_BACKEND, fallback=config.RECOGNIZER_FALLBACK):
+    """Builds the configured backend, falling back to Google if an offline engine can't load."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown recognizer backend '{name}'. Choose one of: {', '.join(BACKENDS)}")
+    if name == "google":
+        return GoogleBackend()
+    try:
+        primary = BACKENDS[name]()
+    except Exception as e:
+        if not fallback:
+            raise
+        print(f"Warning: {name} recognizer unavailable ({e}). Using Google recognition.")
+        return GoogleBackend()
+    return FallbackBackend(primary, GoogleBackend()) if fallback else primary
+
+
+def get_backend():
+    """Returns the shared recognizer backend, loading it on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend()
+        return _backend
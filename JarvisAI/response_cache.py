@@ -0,0 +1,193 @@
+"""Two-tier TTL cache for weather, Wikipedia and joke responses.
+
+Lookups check an in-memory LRU first, then a size-bounded SQLite store in the
+Jarvis_Data directory, so cached answers also survive restarts. Every source
+has a fresh TTL and a longer stale window (RESPONSE_CACHE_TTLS):
+
+- fresh: the cached value is returned.
+- stale: the cached value is returned at once and a background refresh
+  replaces it (stale-while-revalidate).
+- expired or missing: the fetch runs in the foreground. If it fails, any
+  cached value at all is returned instead, so short outages go unnoticed.
+"""
+import contextlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (source TEXT NOT NULL, key TEXT NOT NULL, stored_at REAL NOT NULL,
+                                      used_at REAL NOT NULL, size INTEGER NOT NULL, value TEXT NOT NULL,
+                                      PRIMARY KEY (source, key));
+CREATE INDEX IF NOT EXISTS responses_used ON responses (used_at);
+"""
+
+
+class ResponseCache:
+    """Memory LRU in front of an SQLite store, with per-source TTLs and stale-while-revalidate."""
+
+    def __init__(self, db_path=config.RESPONSE_CACHE_DB, memory_items=config.RESPONSE_CACHE_MEMORY_ITEMS,
+                 max_bytes=config.RESPONSE_CACHE_MAX_BYTES, ttls=None):
+        self.db_path = db_path
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self.ttls = ttls or config.RESPONSE_CACHE_TTLS
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stale_served": 0, "refreshes": 0,
+                       "fetch_errors": 0, "served_after_error": 0}
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Yields a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---------- STORAGE ----------
+
+    def _lookup(self, source, key):
+        """Returns (stored_at, value) from memory or disk, or None."""
+        with self._lock:
+            entry = self._memory.get((source, key))
+            if entry is not None:
+                self._memory.move_to_end((source, key))
+                self.counts["memory_hits"] += 1
+                return entry
+        with self._connect() as conn:
+            row = conn.execute("SELECT stored_at, value FROM responses WHERE source = ? AND key = ?",
+                               (source, key)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET used_at = ? WHERE source = ? AND key = ?", (time.time(), source, key))
+        entry = (row[0], json.loads(row[1]))
+        with self._lock:
+            self.counts["disk_hits"] += 1
+            self._remember(source, key, entry)
+        return entry
+
+    def _remember(self, source, key, entry):
+        self._memory[(source, key)] = entry
+        self._memory.move_to_end((source, key))
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def put(self, source, key, value):
+        now = time.time()
+        encoded = json.dumps(value)
+        with self._lock:
+            self._remember(source, key, (now, value))
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                         (source, key, now, now, len(encoded), encoded))
+            self._evict(conn)
+
+    def _evict(self, conn):
+        """Drops least recently used rows until the store fits in max_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for source, key, size in conn.execute(
+                "SELECT source, key, size FROM responses ORDER BY used_at").fetchall():
+            conn.execute("DELETE FROM responses WHERE source = ? AND key = ?", (source, key))
+            with self._lock:
+                self._memory.pop((source, key), None)
+            total -= size
+            if total <= self.max_bytes:
+                return
+
+    def invalidate(self, source, key):
+        with self._lock:
+            self._memory.pop((source, key), None)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses WHERE source = ? AND key = ?", (source, key))
+
+    # ---------- LOOKUPS ----------
+
+    def get(self, source, key, fetch, *args, keep=None):
+        """Returns the value for (source, key), calling fetch(*args) when it is missing or expired.
+
+        keep(value) decides whether a fetched value may be cached (e.g. only successful API answers).
+        """
+        fresh_for, stale_for = self.ttls.get(source, (0, 0))
+        entry = self._lookup(source, key)
+        age = time.time() - entry[0] if entry else None
+
+        if entry is not None and age < fresh_for:
+            return entry[1]
+        if entry is not None and age < stale_for:
+            with self._lock:
+                self.counts["stale_served"] += 1
+            self.refresh(source, key, fetch, *args, keep=keep)
+            return entry[1]
+
+        with self._lock:
+            self.counts["misses"] += 1
+        try:
+            value = fetch(*args)
+        except Exception:
+            with self._lock:
+                self.counts["fetch_errors"] += 1
+                if entry is not None:
+                    self.counts["served_after_error"] += 1
+            if entry is not None:
+                return entry[1]
+            raise
+        if keep is None or keep(value):
+            self.put(source, key, value)
+        return value
+
+    def refresh(self, source, key, fetch, *args, keep=None):
+        """Refetches (source, key) on a background thread unless a refresh is already running."""
+        with self._lock:
+            if (source, key) in self._refreshing:
+                return
+            self._refreshing.add((source, key))
+            self.counts["refreshes"] += 1
+
+        def run():
+            try:
+                value = fetch(*args)
+                if keep is None or keep(value):
+                    self.put(source, key, value)
+            except Exception as e:
+                with self._lock:
+                    self.counts["fetch_errors"] += 1
+                print(f"Cache Refresh Error ({source}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard((source, key))
+
+        threading.Thread(target=run, name="CacheRefresh", daemon=True).start()
+
+    def stats(self):
+        with self._connect() as conn:
+            rows, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        with self._lock:
+            lookups = self.counts["memory_hits"] + self.counts["disk_hits"] + self.counts["misses"]
+            hits = lookups - self.counts["misses"]
+            return dict(self.counts, memory_items=len(self._memory), disk_items=rows, disk_bytes=size,
+                        hit_rate=hits / lookups if lookups else None)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Returns the shared response cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(config.RESPONSE_CACHE_DB)
+        return _cache
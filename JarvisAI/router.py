@@ -0,0 +1,359 @@
+import re
+from functools import lru_cache
+
+import commands
+import config
+import phrases
+import journal
+import todo_store
+import voice
+from speculation import Speculator
+
+
+class Prefix(str):
+    """A trigger phrase that only matches at the start of the query."""
+
+
+class Pattern(str):
+    """A trigger given as a regular expression, for phrases with a variable part ("top 5 tasks").
+
+    example is a query it matches, used wherever a literal phrase is needed (e.g. the benchmark corpus).
+    """
+
+    def __new__(cls, regex, example):
+        pattern = super().__new__(cls, regex)
+        pattern.example = example
+        return pattern
+
+
+# Every other phrase matches anywhere, but only on whole words so "times" no
+# longer triggers "time" and "update" no longer triggers "date".
+EXIT_PHRASES = ["exit", "bye", "stop listening"]
+OPEN_PHRASES = [Prefix("open "), Prefix("launch ")]
+BRIEFING_PHRASES = ["daily briefing", "morning briefing", "brief me", "my briefing", "start my day"]
+DIAGNOSTICS_PHRASES = ["run diagnostics", "check system", "check memory", "check battery", "system status"]
+FORGET_PHRASES = ["forget that", "forget about", "delete my fact"]
+REMEMBER_PHRASES = ["remember that", "remember my", "save this fact", "my name is", "i am called", "i live in"]
+RECALL_PHRASES = ["what is my", "what is your favorite", "where is my", "where are my", "tell me about my"]
+VOLUME_PHRASES = ["set volume to", "change volume to", "volume up", "volume down"]
+DELETE_FILE_PHRASES = ["delete file", "remove file", "trash file"]
+SEARCH_NOTES_PHRASES = ["what did i note", "what did i write", "search my notes", "read my notes", "my notes"]
+NOTE_PHRASES = ["create note", "make a note", "write down", "journal that"]
+CONVERT_PHRASES = ["convert", "conversion"]
+CLIPBOARD_PHRASES = ["what's copied", "read clipboard", "process clipboard", "what did i copy"]
+CONTENT_SEARCH_PHRASES = [Prefix("search inside files for"), Prefix("search in files for"),
+                          Prefix("search file contents for"), Prefix("find text")]
+FILE_SEARCH_PHRASES = [Prefix("search file for"), Prefix("find file for"), Prefix("search local for")]
+TRIP_PHRASES = ["plan a trip", "book a flight", "find a hotel", "trip to", "commute"]
+MAPS_PHRASES = ["directions to", "map of", "show me on map", "where is"]
+YOUTUBE_PHRASES = ["search youtube", "find on youtube", "play on youtube"]
+TIME_PHRASES = ["time"]
+DATE_PHRASES = ["date", "today's date"]
+WEATHER_PHRASES = ["weather", "temperature"]
+NEWS_PHRASES = ["news", "headlines"]
+WIKIPEDIA_PHRASES = ["wikipedia", "tell me about"]
+JOKE_PHRASES = ["tell me a joke", "joke"]
+ADD_TODO_PHRASES = ["add to do", "add task"]
+COMPLETE_TODO_PHRASES = ["complete task", "finish task", "finished task", "mark task", "done with task"]
+REMOVE_TODO_PHRASES = ["remove task", "delete task"]
+TODAY_TODO_PHRASES = ["today's tasks", "tasks for today", "tasks due today", "due today"]
+# "top" alone is too common ("top 10 movies", "top gun"); a task word has to follow it.
+TOP_TODO_PHRASES = [Pattern(r"\btop (?:\w+ )?(?:of (?:my |the )?)?tasks?\b", "top 3 tasks"), "most important tasks"]
+MORE_TODO_PHRASES = ["more tasks", "next tasks"]
+VIEW_TODO_PHRASES = ["view to do", "what are my tasks", "show my tasks", "list my tasks"]
+CLEAR_TODO_PHRASES = ["clear to do"]
+MUSIC_PHRASES = ["music", "spotify", "play"]
+CALCULATION_PHRASES = ["plus", "minus", "times", "divide", "+", "-", "*", "/", "^", "square", "root", "sin", "cos",
+                       "tan", "calculate", "divided by", "multiplied by", "squared", "cubed", "power of", "factorial",
+                       "sine", "cosine", "tangent", "sum of", "product of", "average of"]
+
+WEBSITE_TERMS = ["website", "site", "go to", "url"]
+WEBSITE_SUFFIXES = [".com", ".org", ".net", ".edu", ".gov"]
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton that finds every trigger phrase in a single pass over the query."""
+
+    def __init__(self, phrases):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for phrase, value in phrases:
+            state = 0
+            for char in phrase:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append((len(phrase), value))
+
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find_all(self, text):
+        """Yields (start, end, value) for every phrase occurrence in text."""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, value in self.output[state]:
+                yield index - length + 1, index + 1, value
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "'"
+
+
+def _bounded(text, start, end):
+    """True if text[start:end] is not glued to a neighbouring word."""
+    phrase = text[start:end]
+    if _is_word_char(phrase[0]) and start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if _is_word_char(phrase[-1]) and end < len(text) and _is_word_char(text[end]):
+        return False
+    return True
+
+
+def normalize(query):
+    """Lowercases the query and collapses whitespace so cache keys are stable."""
+    return " ".join(query.lower().split())
+
+
+def _strip_phrases(query, phrases):
+    for phrase in phrases:
+        query = query.replace(phrase, "")
+    return query.strip()
+
+
+# ---------- HANDLERS ----------
+
+def open_target(query):
+    """Splits an open/launch query into ("website", site) or ("app", name)."""
+    content = query.replace("open ", "", 1).replace("launch ", "", 1).strip()
+    is_website_command = any(term in query for term in WEBSITE_TERMS) or any(
+        suffix in content for suffix in WEBSITE_SUFFIXES)
+
+    if is_website_command:
+        site = content
+        if "go to" in query:
+            site = query.split("go to")[-1].strip()
+        site = site.replace("website", "").replace("site", "").replace("go to", "").strip()
+        return "website", site
+    if content == "chrome":
+        return "app", "Google Chrome"
+    return "app", content
+
+
+def handle_open(query):
+    kind, target = open_target(query)
+    if kind == "website":
+        if target in ("any kind of", ""):
+            voice.say(phrases.OPENING_GOOGLE)
+            target = "google.com"
+        commands.open_website(target)
+    elif target in ("app", "application", ""):
+        voice.say("Please specify the application name after saying 'open'.")
+    else:
+        commands.open_app(target)
+
+
+def app_to_resolve(query):
+    kind, target = open_target(query)
+    return target if kind == "app" and target not in ("app", "application") else ""
+
+
+def handle_file_search(query):
+    keyword = query.split("for", 1)[-1].strip()
+    if keyword:
+        commands.search_local_files(keyword)
+    else:
+        voice.say(phrases.ASK_KEYWORD)
+
+
+def handle_search_notes(query):
+    start, end = journal.date_range(query)
+    match = re.search(r"\b(?:about|on|for|mentioning)\b (.+)", query)
+    keywords = match.group(1) if match else ""
+    keywords = re.sub(r"\b(?:today|yesterday|(?:this|last) (?:week|month)|(?:last|past) \d+ days)\b", "", keywords)
+    commands.search_notes(keywords.strip(" ?."), start, end)
+
+
+def handle_content_search(query):
+    keyword = query.split("for", 1)[-1] if " for " in query else query.split("find text", 1)[-1]
+    keyword = keyword.strip(" ?.\"'")
+    if keyword:
+        commands.search_file_contents(keyword)
+    else:
+        voice.say(phrases.ASK_KEYWORD)
+
+
+def weather_city(query):
+    match = re.search(r".*\bin\b(.+)", query)
+    city = match.group(1).strip(" ?.") if match else ""
+    return city or config.DEFAULT_CITY
+
+
+def handle_weather(query):
+    commands.get_weather(weather_city(query))
+
+
+def wikipedia_term(query):
+    return query.split("wikipedia")[-1].split("tell me about")[-1].strip()
+
+
+def handle_wikipedia(query):
+    term = wikipedia_term(query)
+    if term:
+        commands.search_wikipedia(term)
+    else:
+        voice.say(phrases.ASK_WIKIPEDIA_TOPIC)
+
+
+def handle_add_todo(query):
+    task = query.split("add to do")[-1].split("add task")[-1].strip()
+    if task:
+        commands.add_todo(task)
+    else:
+        voice.say(phrases.ASK_TASK)
+
+
+def todo_reference(query):
+    reference = _strip_phrases(query, COMPLETE_TODO_PHRASES + REMOVE_TODO_PHRASES + ["as done", "as complete"])
+    return re.sub(r"^(?:number|the)\s+", "", reference.strip(" ."))
+
+
+def handle_todo_change(query, change):
+    reference = todo_reference(query)
+    if reference:
+        change(reference)
+    else:
+        voice.say("Which task? You can say its number or part of its name.")
+
+
+def handle_top_todo(query):
+    match = re.search(r"\btop (\w+)", query)
+    count = todo_store.task_number(match.group(1)) if match else None
+    commands.view_top_tasks(count or 3)
+
+
+def handle_calculation(query):
+    commands.perform_calculation(_strip_phrases(query, ["what is", "calculate", "?"]))
+
+
+# Ordered by priority: when several intents match, the one listed first wins.
+INTENTS = [
+    ("exit", EXIT_PHRASES, None),
+    ("open", OPEN_PHRASES, handle_open),
+    ("shutdown", ["shutdown"], lambda query: commands.shutdown()),
+    ("restart", ["restart"], lambda query: commands.restart()),
+    ("briefing", BRIEFING_PHRASES, lambda query: commands.daily_briefing()),
+    ("diagnostics", DIAGNOSTICS_PHRASES, lambda query: commands.run_diagnostics()),
+    ("forget_fact", FORGET_PHRASES, commands.forget_fact),
+    ("remember_fact", REMEMBER_PHRASES, commands.remember_fact),
+    ("recall_fact", RECALL_PHRASES, commands.recall_fact),
+    ("volume", VOLUME_PHRASES, commands.set_system_volume),
+    ("delete_file", DELETE_FILE_PHRASES, commands.delete_file),
+    ("search_notes", SEARCH_NOTES_PHRASES, handle_search_notes),
+    ("create_note", NOTE_PHRASES, commands.create_note),
+    ("convert", CONVERT_PHRASES, commands.convert_units),
+    ("clipboard", CLIPBOARD_PHRASES, lambda query: commands.process_clipboard()),
+    ("content_search", CONTENT_SEARCH_PHRASES, handle_content_search),
+    ("file_search", FILE_SEARCH_PHRASES, handle_file_search),
+    ("trip", TRIP_PHRASES, commands.plan_trip_search),
+    ("maps", MAPS_PHRASES, commands.search_maps),
+    ("youtube", YOUTUBE_PHRASES, commands.search_youtube),
+    ("time", TIME_PHRASES, lambda query: commands.get_time()),
+    ("date", DATE_PHRASES, lambda query: commands.get_date()),
+    ("weather", WEATHER_PHRASES, handle_weather),
+    ("news", NEWS_PHRASES, lambda query: commands.get_news()),
+    ("wikipedia", WIKIPEDIA_PHRASES, handle_wikipedia),
+    ("joke", JOKE_PHRASES, lambda query: commands.tell_a_joke()),
+    ("add_todo", ADD_TODO_PHRASES, handle_add_todo),
+    ("complete_todo", COMPLETE_TODO_PHRASES, lambda query: handle_todo_change(query, commands.complete_todo)),
+    ("remove_todo", REMOVE_TODO_PHRASES, lambda query: handle_todo_change(query, commands.remove_todo)),
+    ("today_todo", TODAY_TODO_PHRASES, lambda query: commands.view_todays_tasks()),
+    ("more_todo", MORE_TODO_PHRASES, lambda query: commands.view_todo(more=True)),
+    ("top_todo", TOP_TODO_PHRASES, handle_top_todo),
+    ("view_todo", VIEW_TODO_PHRASES, lambda query: commands.view_todo()),
+    ("clear_todo", CLEAR_TODO_PHRASES, lambda query: commands.clear_todo()),
+    ("music", MUSIC_PHRASES, lambda query: commands.play_music()),
+    ("calculation", CALCULATION_PHRASES, handle_calculation),
+]
+FALLBACK_INTENT = "web_search"
+
+HANDLERS = {name: handler for name, _, handler in INTENTS}
+HANDLERS[FALLBACK_INTENT] = commands.search_web_general
+
+
+def _compile(intents):
+    """Returns the phrase matcher for the literal triggers and [(priority, name, regex)] for the Patterns."""
+    phrases, patterns = [], []
+    for priority, (name, triggers, _) in enumerate(intents):
+        for phrase in triggers:
+            if isinstance(phrase, Pattern):
+                patterns.append((priority, name, re.compile(phrase)))
+            else:
+                phrases.append((str(phrase), (priority, name, isinstance(phrase, Prefix))))
+    return PhraseMatcher(phrases), patterns
+
+
+_matcher, _patterns = _compile(INTENTS)
+
+
+@lru_cache(maxsize=1024)
+def classify(normalized_query):
+    """Returns the name of the highest-priority intent triggered by an already normalized query."""
+    best = None
+    for start, end, (priority, name, anchored) in _matcher.find_all(normalized_query):
+        if best is not None and priority >= best[0]:
+            continue
+        if anchored and start != 0:
+            continue
+        if not _bounded(normalized_query, start, end):
+            continue
+        best = (priority, name)
+    for priority, name, regex in _patterns:
+        if (best is None or priority < best[0]) and regex.search(normalized_query):
+            best = (priority, name)
+    return best[1] if best else FALLBACK_INTENT
+
+
+# Slow, side-effect-free work that can start from a partial transcript.
+PREFETCHERS = {
+    "weather": (weather_city, commands.fetch_weather),
+    "wikipedia": (wikipedia_term, commands.fetch_wikipedia_summary),
+    "open": (app_to_resolve, commands.resolve_app),
+}
+
+speculator = Speculator(classify, PREFETCHERS)
+
+
+def speculate(partial_query):
+    """Feeds a partial recognition hypothesis to the speculator."""
+    speculator.on_partial(normalize(partial_query))
+
+
+def dispatch(query):
+    """Routes a recognized query to its command and returns the intent name.
+
+    The "exit" intent has no handler; each front-end decides how to shut down.
+    """
+    query = normalize(query)
+    speculator.commit(query)
+    intent = classify(query)
+    handler = HANDLERS[intent]
+    if handler is not None:
+        handler(query)
+    return intent
@@ -0,0 +1,83 @@
+"""Speculative prefetching on partial recognition hypotheses.
+
+Streaming recognizers report partial transcripts while the user is still
+talking. The Speculator classifies each partial and, once the argument of a
+network-backed intent has stopped changing, starts the slow part (a weather
+or Wikipedia fetch, resolving an app) in the background. When the final
+transcript is dispatched, the matching fetch is committed and handed to the
+command through result_for(); everything else is cancelled.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculation")
+_committed = {}
+_committed_lock = threading.Lock()
+
+
+def result_for(key, fetch, *args):
+    """Returns the committed speculative result for key, or calls fetch(*args) if there is none."""
+    with _committed_lock:
+        future = _committed.pop(key, None)
+    if future is not None:
+        try:
+            return future.result()
+        except CancelledError:
+            pass
+    return fetch(*args)
+
+
+class Speculator:
+    """Starts prefetches from stable partial hypotheses and commits or cancels them on the final text.
+
+    prefetchers maps an intent name to (extract_argument(query), fetch(argument)).
+    classify(query) must return the intent name for a normalized query.
+    """
+
+    def __init__(self, classify, prefetchers, max_age=30.0):
+        self.classify = classify
+        self.prefetchers = prefetchers
+        self.max_age = max_age
+        self.started = 0
+        self.hits = 0
+        self._pending = {}
+        self._last_key = None
+        self._lock = threading.Lock()
+
+    def _key(self, query):
+        intent = self.classify(query)
+        if intent not in self.prefetchers:
+            return None
+        argument = self.prefetchers[intent][0](query)
+        return (intent, argument) if argument else None
+
+    def on_partial(self, query):
+        """Feeds one partial hypothesis; prefetches once the same key is seen twice in a row."""
+        key = self._key(query)
+        with self._lock:
+            stable = key is not None and key == self._last_key
+            self._last_key = key
+            if not stable or key in self._pending:
+                return
+            fetch = self.prefetchers[key[0]][1]
+            self._pending[key] = (time.monotonic(), _executor.submit(fetch, key[1]))
+            self.started += 1
+        print(f"Speculating on {key[0]}: {key[1]}")
+
+    def commit(self, query):
+        """Keeps the prefetch matching the final query for result_for() and cancels the rest."""
+        key = self._key(query)
+        now = time.monotonic()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_key = None
+
+        with _committed_lock:
+            _committed.clear()
+            for pending_key, (started, future) in pending.items():
+                if pending_key == key and now - started <= self.max_age:
+                    _committed[pending_key] = future
+                    self.hits += 1
+                else:
+                    future.cancel()
@@ -0,0 +1,278 @@
+"""The assistant's single speech-output service.
+
+One worker thread owns the pyttsx3 engine (created on first use, so importing
+voice no longer starts a TTS driver) and drains a priority queue: errors and
+confirmations jump ahead of long lists such as news headlines. Talking over the
+assistant cancels whatever is still queued or playing (barge-in), and the service
+keeps queue-depth and time-to-first-audio figures for diagnostics.
+
+Recurring phrases are played from tts_cache instead of being re-synthesized;
+the worker renders new cache entries while the queue is idle.
+
+Long answers are split into sentences so the first one plays as soon as it
+alone is synthesized, and bursts of short queued items (news headlines, to-do
+entries, the rest of a long answer) are merged into one engine run instead of
+paying runAndWait's start-up and tear-down for each.
+"""
+import itertools
+import os
+import re
+import threading
+import time
+from queue import PriorityQueue, Empty
+
+import pyttsx3
+
+import config
+from tts_cache import TTSCache, AudioPlayer
+
+URGENT = 0
+NORMAL = 1
+LOW = 2
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+
+
+def split_sentences(text, min_length=config.SPEECH_SPLIT_CHARS):
+    """Splits text into sentences when it is long enough for streaming to matter."""
+    if len(text) < min_length:
+        return [text]
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+class Utterance:
+    def __init__(self, text, priority, generation, lead=False):
+        self.text = text
+        self.priority = priority
+        self.generation = generation
+        self.lead = lead
+        self.queued_at = time.monotonic()
+        self.started_at = None
+
+
+class SpeechService:
+    """Priority speech queue drained by one worker thread with a lazily created engine."""
+
+    def __init__(self, max_queue=config.SPEECH_MAX_QUEUE):
+        self.max_queue = max_queue
+        self._queue = PriorityQueue()
+        self._sequence = itertools.count()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._engine = None
+        self._thread = None
+        self._current = []
+        self.cache = None
+        self.player = AudioPlayer()
+
+        self.spoken = 0
+        self.engine_runs = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.last_time_to_first_audio = None
+        self._total_time_to_first_audio = 0.0
+
+    # ---------- PUBLIC API ----------
+
+    def speak(self, text, priority=NORMAL):
+        """Queues text for playback, one sentence at a time, and starts the worker on first use."""
+        self.start()
+        sentences = split_sentences(text)
+        with self._lock:
+            if self._queue.qsize() >= self.max_queue:
+                if priority >= LOW:
+                    self.dropped += 1
+                    return
+                self._drop_lowest()
+            for index, sentence in enumerate(sentences):
+                utterance = Utterance(sentence, priority, self._generation, lead=index == 0 and len(sentences) > 1)
+                self._queue.put((priority, next(self._sequence), utterance))
+
+    def is_speaking(self):
+        """True while an utterance is playing or waiting in the queue."""
+        with self._lock:
+            return bool(self._current) or not self._queue.empty()
+
+    def cancel(self):
+        """Barge-in: drops everything queued and stops the utterance that is playing."""
+        with self._lock:
+            self._generation += 1
+            self.cancelled += self._drain()
+            playing = bool(self._current)
+        if not playing:
+            return
+        try:
+            self.player.stop()
+            if self._engine is not None:
+                self._engine.stop()
+        except Exception as e:
+            print(f"TTS Error: {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SpeechService", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Stops playback and lets the worker exit."""
+        if self._thread is None:
+            return
+        self.cancel()
+        self._queue.put((-1, next(self._sequence), None))
+        self._thread.join(timeout=2)
+        self._thread = None
+
+    def stats(self):
+        spoken = self.spoken or 1
+        return {
+            "queue_depth": self._queue.qsize(),
+            "spoken": self.spoken,
+            "engine_runs": self.engine_runs,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "cancelled": self.cancelled,
+            "last_time_to_first_audio": self.last_time_to_first_audio,
+            "mean_time_to_first_audio": self._total_time_to_first_audio / spoken if self.spoken else None,
+            "cache": self.cache.stats() if self.cache else None,
+        }
+
+    # ---------- WORKER ----------
+
+    def _drain(self):
+        drained = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+                drained += 1
+            except Empty:
+                return drained
+
+    def _drop_lowest(self):
+        """Makes room for an important utterance by discarding the lowest-priority queued item."""
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except Empty:
+                break
+        items.sort()
+        if items:
+            items.pop()
+            self.dropped += 1
+        for item in items:
+            self._queue.put(item)
+
+    def _get_engine(self):
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty('rate', config.VOICE_RATE)
+            try:
+                self._engine.setProperty('voice', config.VOICE_ID)
+            except Exception:
+                print("Warning: Specific voice ID not found. Using default voice.")
+            self._engine.connect('started-utterance', self._on_started)
+        return self._engine
+
+    def _on_started(self, name=None):
+        for utterance in self._current:
+            if name is not None and name != str(id(utterance)):
+                continue
+            if utterance.started_at is None:
+                utterance.started_at = time.monotonic()
+                self.last_time_to_first_audio = utterance.started_at - utterance.queued_at
+                self._total_time_to_first_audio += self.last_time_to_first_audio
+            return
+
+    def _coalesce(self, first):
+        """Pulls queued utterances that can share first's engine run, up to SPEECH_COALESCE_CHARS."""
+        batch = [first]
+        if first.lead:
+            return batch
+        length = len(first.text)
+        while length < config.SPEECH_COALESCE_CHARS:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            utterance = item[2]
+            if (utterance is None or utterance.lead or utterance.priority != first.priority
+                    or utterance.generation != first.generation
+                    or (self.cache and os.path.exists(self.cache.path_for(utterance.text)))):
+                self._queue.put(item)
+                break
+            batch.append(utterance)
+            length += len(utterance.text)
+        return batch
+
+    def _play(self, batch):
+        """Plays a single cached utterance from disk, otherwise synthesizes the batch in one engine run."""
+        if len(batch) == 1:
+            path = self.cache.lookup(batch[0].text) if self.cache else None
+            if path:
+                try:
+                    self._on_started()
+                    self.player.play(path)
+                    return
+                except Exception as e:
+                    print(f"TTS Cache Error: {e}")
+        elif self.cache:
+            for utterance in batch:
+                self.cache.lookup(utterance.text)
+
+        engine = self._get_engine()
+        for utterance in batch:
+            engine.say(utterance.text, str(id(utterance)))
+        engine.runAndWait()
+        self.engine_runs += 1
+        self.coalesced += len(batch) - 1
+
+    def _run(self):
+        if config.TTS_CACHE_ENABLED:
+            try:
+                self.cache = TTSCache(voice_id=self._get_engine().getProperty('voice'))
+            except Exception as e:
+                print(f"Warning: TTS cache disabled ({e}).")
+
+        while True:
+            rendering = self.cache is not None and self.cache.has_pending_renders()
+            try:
+                _, _, utterance = self._queue.get(timeout=0.1 if rendering else None)
+            except Empty:
+                # Idle: render one pending cache entry at a time so new speech is never kept waiting long.
+                try:
+                    self.cache.render_next(self._get_engine())
+                except Exception as e:
+                    print(f"TTS Cache Error: {e}")
+                continue
+            if utterance is None:
+                break
+            with self._lock:
+                if utterance.generation != self._generation:
+                    continue
+                batch = self._coalesce(utterance)
+                self._current = batch
+            try:
+                self._play(batch)
+                self.spoken += len(batch)
+            except Exception as e:
+                print(f"TTS Error: {e}")
+            finally:
+                with self._lock:
+                    self._current = []
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service():
+    """Returns the process-wide speech service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SpeechService()
+        return _service
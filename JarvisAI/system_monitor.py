@@ -0,0 +1,179 @@
+"""Background system-metrics sampler behind run_diagnostics.
+
+One daemon thread samples CPU and memory every METRICS_INTERVAL seconds, and
+disk, battery and the busiest processes every METRICS_SLOW_EVERY samples. The
+samples go into fixed-size ring buffers that hold METRICS_HISTORY_SECONDS.
+CPU is measured as the usage since the previous sample, so nothing ever
+blocks. Diagnostics are answered from these buffers at once, with current,
+1-minute and 5-minute figures. The same thread checks the alert thresholds
+(METRICS_ALERTS) and calls alert(text) once when a threshold is crossed. The
+alert is re-armed only after the value has recovered by
+METRICS_ALERT_HYSTERESIS.
+"""
+import threading
+import time
+from collections import deque
+
+import config
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+METRICS = ("cpu", "memory", "disk", "battery")
+
+
+class Sampler:
+    """Ring-buffered CPU, memory, disk, battery and top-process history."""
+
+    def __init__(self, interval=config.METRICS_INTERVAL, history_seconds=config.METRICS_HISTORY_SECONDS,
+                 slow_every=config.METRICS_SLOW_EVERY, alerts=None, alert=None):
+        self.interval = interval
+        self.slow_every = slow_every
+        self.alerts = config.METRICS_ALERTS if alerts is None else alerts
+        self.alert = alert
+        length = int(history_seconds / interval) + 1
+        self.history = {metric: deque(maxlen=length) for metric in METRICS}
+        self.top_processes = []
+        self.plugged = None
+        self.memory_total = None
+        self.memory_available = None
+        self.samples = 0
+        self.sample_seconds = 0.0
+        self._armed = {name: True for name in self.alerts}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        psutil.cpu_percent(interval=None)  # the first reading only sets the baseline
+        self._thread = threading.Thread(target=self._run, name="SystemMonitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+                self._check_alerts()
+            except Exception as e:
+                print(f"System Monitor Error: {e}")
+
+    # ---------- SAMPLING ----------
+
+    def sample(self, cpu_interval=None):
+        """Takes one sample; disk, battery and processes only every slow_every samples.
+
+        cpu_interval is how long to measure CPU for; None measures since the previous call without blocking.
+        """
+        started = time.perf_counter()
+        now = time.time()
+        cpu = psutil.cpu_percent(interval=cpu_interval)
+        memory = psutil.virtual_memory()
+        slow = self.samples % self.slow_every == 0
+        if slow:
+            disk = psutil.disk_usage(config.METRICS_DISK_PATH).percent
+            battery = psutil.sensors_battery()
+            top = self._busiest_processes()
+        with self._lock:
+            self.history["cpu"].append((now, cpu))
+            self.history["memory"].append((now, memory.percent))
+            self.memory_total, self.memory_available = memory.total, memory.available
+            if slow:
+                self.history["disk"].append((now, disk))
+                if battery is not None:
+                    self.history["battery"].append((now, battery.percent))
+                    self.plugged = battery.power_plugged
+                self.top_processes = top
+            self.samples += 1
+            self.sample_seconds += time.perf_counter() - started
+
+    def _busiest_processes(self):
+        """(name, cpu percent) of the top processes since the previous slow sample."""
+        usage = []
+        for process in psutil.process_iter(["pid", "name", "cpu_percent"]):
+            info = process.info
+            # Windows reports idle time as PID 0, "System Idle Process"; it is never the busiest process.
+            if info.get("pid") == 0 or info.get("name") == "System Idle Process":
+                continue
+            if info.get("cpu_percent"):
+                usage.append((info.get("name") or "unknown", info["cpu_percent"]))
+        usage.sort(key=lambda item: item[1], reverse=True)
+        return usage[:config.METRICS_TOP_PROCESSES]
+
+    # ---------- QUERIES ----------
+
+    def current(self, metric):
+        with self._lock:
+            series = self.history[metric]
+            return series[-1][1] if series else None
+
+    def average(self, metric, seconds):
+        """Mean of metric over the last seconds, or None without samples."""
+        cutoff = time.time() - seconds
+        with self._lock:
+            values = [value for stamp, value in self.history[metric] if stamp >= cutoff]
+        return sum(values) / len(values) if values else None
+
+    def stats(self):
+        with self._lock:
+            return {"samples": self.samples, "mean_sample_ms": self.sample_seconds / self.samples * 1000
+                    if self.samples else None, "buffered": {metric: len(series) for metric, series
+                                                            in self.history.items()}}
+
+    # ---------- ALERTS ----------
+
+    def _reading(self, name):
+        """The value an alert is judged on, or None when there is nothing to judge."""
+        if name == "battery_low":
+            return None if self.plugged else self.current("battery")
+        if name == "disk_high":
+            return self.current("disk")
+        return self.average("memory" if name == "memory_high" else "cpu", 60)
+
+    def _check_alerts(self):
+        if self.alert is None:
+            return
+        for name, threshold in self.alerts.items():
+            if threshold is None:
+                continue
+            value = self._reading(name)
+            if value is None:
+                self._armed[name] = True
+                continue
+            # battery_low fires below its threshold, the others above it.
+            excess = threshold - value if name == "battery_low" else value - threshold
+            if self._armed[name] and excess >= 0:
+                self._armed[name] = False
+                self.alert(self.describe_alert(name))
+            elif excess < -config.METRICS_ALERT_HYSTERESIS:
+                self._armed[name] = True
+
+    def describe_alert(self, name):
+        if name == "battery_low":
+            return f"Your battery is down to {self.current('battery'):.0f} percent. Please plug in the charger."
+        if name == "memory_high":
+            return f"Memory usage has been above {self.alerts[name]} percent for the last minute."
+        if name == "cpu_high":
+            busiest = f" {self.top_processes[0][0]} is the busiest process." if self.top_processes else ""
+            return f"CPU usage has been above {self.alerts[name]} percent for the last minute.{busiest}"
+        return f"Your disk is {self.current('disk'):.0f} percent full."
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler(alert=None):
+    """Returns the shared sampler, started on first use; alert is only used when it is created."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = Sampler(alert=alert).start()
+        return _sampler
@@ -0,0 +1,211 @@
+"""SQLite-backed to-do list.
+
+Tasks live in todo.db in the Jarvis_Data directory with indexed created, due,
+priority and done columns, so "complete task 2", "today's tasks" and "top 3
+tasks" are single queries and every change is one transaction. The old
+todo_list.txt is imported on first use and renamed to todo_list.txt.migrated.
+"""
+import contextlib
+import datetime
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    created REAL NOT NULL,
+    due TEXT,
+    priority INTEGER NOT NULL DEFAULT 1,
+    done INTEGER NOT NULL DEFAULT 0,
+    done_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_open ON tasks (done, priority DESC, due, created);
+CREATE INDEX IF NOT EXISTS tasks_due ON tasks (done, due);
+"""
+
+LOW, NORMAL, HIGH = 0, 1, 2
+PRIORITY_WORDS = [("high priority", HIGH), ("urgent", HIGH), ("important", HIGH), ("low priority", LOW)]
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+                "nine": 9, "ten": 10, "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5}
+# Pending tasks are always listed in this order, so spoken task numbers stay stable between commands.
+PENDING_ORDER = "priority DESC, due IS NULL, due, created"
+
+
+def parse_task(text, today=None):
+    """Splits "buy milk tomorrow high priority" into ("buy milk", due ISO date or None, priority)."""
+    today = today or datetime.date.today()
+    priority = NORMAL
+    for phrase, value in PRIORITY_WORDS:
+        if phrase in text:
+            priority = value
+            text = text.replace(phrase, " ")
+
+    due = None
+    match = re.search(r"\b(?:due |by |on )?(today|tomorrow|tonight|" + "|".join(WEEKDAYS) + r")\b", text)
+    if match:
+        word = match.group(1)
+        if word in ("today", "tonight"):
+            due = today
+        elif word == "tomorrow":
+            due = today + datetime.timedelta(days=1)
+        else:
+            due = today + datetime.timedelta(days=(WEEKDAYS.index(word) - today.weekday()) % 7 or 7)
+        text = text[:match.start()] + text[match.end():]
+
+    return " ".join(text.split()).strip(" ,."), due.isoformat() if due else None, priority
+
+
+def task_number(reference):
+    """Returns the spoken position in "2", "two" or "the second one", or None for a text reference."""
+    words = [word for word in reference.split() if word not in ("the", "number", "task", "one")] or ["one"]
+    if len(words) != 1:
+        return None
+    if words[0].isdigit():
+        return int(words[0])
+    return NUMBER_WORDS.get(words[0])
+
+
+class Task:
+    def __init__(self, row):
+        self.id, self.text, self.created, self.due, self.priority, self.done = row
+
+    def describe(self, today=None):
+        """Spoken form: the text plus its due date and priority when they matter."""
+        today = today or datetime.date.today()
+        parts = [self.text]
+        if self.due:
+            due = datetime.date.fromisoformat(self.due)
+            if due < today:
+                parts.append(f"overdue since {due.strftime('%A')}")
+            elif due == today:
+                parts.append("due today")
+            elif due == today + datetime.timedelta(days=1):
+                parts.append("due tomorrow")
+            else:
+                parts.append(f"due {due.strftime('%A')}")
+        if self.priority == HIGH:
+            parts.append("high priority")
+        return ", ".join(parts)
+
+
+class TodoStore:
+    """Task list in SQLite; every change runs in its own transaction."""
+
+    def __init__(self, db_path=config.TODO_DB, legacy_path=config.TODO_FILE):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        if legacy_path:
+            self._migrate(legacy_path)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Yields a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _migrate(self, legacy_path):
+        """Imports the lines of the old todo_list.txt once, then renames it out of the way."""
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, "r") as f:
+                lines = [line.strip().lstrip("- ").strip() for line in f]
+            created = os.path.getmtime(legacy_path)
+            with self._lock, self._connect() as conn:
+                conn.executemany("INSERT INTO tasks (text, created) VALUES (?, ?)",
+                                 [(line, created) for line in lines if line])
+            os.replace(legacy_path, legacy_path + ".migrated")
+            print(f"To-do: imported {len(lines)} tasks from {legacy_path}")
+        except (IOError, OSError, sqlite3.Error) as e:
+            print(f"To-do Migration Error: {e}")
+
+    # ---------- CHANGES ----------
+
+    def add(self, text, due=None, priority=NORMAL):
+        with self._lock, self._connect() as conn:
+            return conn.execute("INSERT INTO tasks (text, created, due, priority) VALUES (?, ?, ?, ?)",
+                                (text, time.time(), due, priority)).lastrowid
+
+    def complete(self, reference):
+        """Marks the referenced pending task done and returns it, or None if nothing matched."""
+        with self._lock, self._connect() as conn:
+            task = self._resolve(conn, reference)
+            if task:
+                conn.execute("UPDATE tasks SET done = 1, done_at = ? WHERE id = ?", (time.time(), task.id))
+            return task
+
+    def remove(self, reference):
+        """Deletes the referenced pending task and returns it, or None if nothing matched."""
+        with self._lock, self._connect() as conn:
+            task = self._resolve(conn, reference)
+            if task:
+                conn.execute("DELETE FROM tasks WHERE id = ?", (task.id,))
+            return task
+
+    def clear(self):
+        """Deletes every task; returns (pending, completed), how many of each there were."""
+        with self._lock, self._connect() as conn:
+            pending = conn.execute("SELECT COUNT(*) FROM tasks WHERE done = 0").fetchone()[0]
+            removed = conn.execute("DELETE FROM tasks").rowcount
+            return pending, removed - pending
+
+    def _resolve(self, conn, reference):
+        number = task_number(reference)
+        if number is not None:
+            if number < 1:
+                return None
+            row = conn.execute(f"SELECT id, text, created, due, priority, done FROM tasks WHERE done = 0 "
+                               f"ORDER BY {PENDING_ORDER} LIMIT 1 OFFSET ?", (number - 1,)).fetchone()
+        else:
+            pattern = "%" + reference.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            row = conn.execute(f"SELECT id, text, created, due, priority, done FROM tasks "
+                               f"WHERE done = 0 AND text LIKE ? ESCAPE '\\' ORDER BY {PENDING_ORDER} LIMIT 1",
+                               (pattern,)).fetchone()
+        return Task(row) if row else None
+
+    # ---------- QUERIES ----------
+
+    def pending(self, limit=-1, offset=0):
+        """Returns pending tasks, most important first."""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT id, text, created, due, priority, done FROM tasks WHERE done = 0 "
+                                f"ORDER BY {PENDING_ORDER} LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+        return [Task(row) for row in rows]
+
+    def due_by(self, day=None):
+        """Returns pending tasks due on or before day (default: today)."""
+        day = (day or datetime.date.today()).isoformat()
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT id, text, created, due, priority, done FROM tasks "
+                                f"WHERE done = 0 AND due <= ? ORDER BY {PENDING_ORDER}", (day,)).fetchall()
+        return [Task(row) for row in rows]
+
+    def count_pending(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tasks WHERE done = 0").fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Returns the shared to-do store, migrating todo_list.txt on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TodoStore(config.TODO_DB, config.TODO_FILE)
+        return _store
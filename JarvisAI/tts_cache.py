@@ -0,0 +1,167 @@
+"""Content-addressed cache of pre-rendered speech audio.
+
+Fixed responses ("Sorry, I didn't catch that", the greeting, error messages)
+are rendered once with pyttsx3's save_to_file and played straight from disk
+afterwards. Files are keyed by text, voice ID and rate, and the directory is
+kept under TTS_CACHE_MAX_BYTES by evicting the least recently played files.
+
+Run `python tts_cache.py` once after installing to pre-render COMMON_PHRASES.
+"""
+import hashlib
+import os
+import platform
+import subprocess
+import threading
+from collections import OrderedDict
+
+import config
+import phrases
+
+COMMON_PHRASES = [text for name, text in vars(phrases).items() if name.isupper()]
+
+
+class AudioPlayer:
+    """Plays a rendered file with the platform's command-line player; stop() interrupts it."""
+
+    def __init__(self):
+        self._process = None
+        self._lock = threading.Lock()
+
+    def play(self, path):
+        system = platform.system()
+        if system == "Windows":
+            import winsound
+            winsound.PlaySound(path, winsound.SND_FILENAME)
+            return
+        command = ["afplay", path] if system == "Darwin" else ["aplay", "-q", path]
+        with self._lock:
+            self._process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if self._process.wait() != 0:
+                raise RuntimeError(f"{command[0]} exited with code {self._process.returncode}")
+        finally:
+            with self._lock:
+                self._process = None
+
+    def stop(self):
+        if platform.system() == "Windows":
+            import winsound
+            winsound.PlaySound(None, winsound.SND_PURGE)
+            return
+        with self._lock:
+            if self._process is not None:
+                self._process.terminate()
+
+
+class TTSCache:
+    """Maps (text, voice, rate) to a rendered audio file, with size-bounded LRU eviction.
+
+    voice_id should be the voice the engine actually uses (engine.getProperty('voice')), which differs
+    from config.VOICE_ID when that voice isn't installed.
+    """
+
+    def __init__(self, cache_dir=config.TTS_CACHE_DIR, max_bytes=config.TTS_CACHE_MAX_BYTES,
+                 min_repeats=config.TTS_CACHE_MIN_REPEATS, voice_id=config.VOICE_ID, rate=config.VOICE_RATE,
+                 max_tracked=config.TTS_CACHE_MAX_TRACKED):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.min_repeats = min_repeats
+        self.max_tracked = max_tracked
+        self.voice_id = voice_id
+        self.rate = rate
+        self.extension = ".aiff" if platform.system() == "Darwin" else ".wav"
+        self.hits = 0
+        self.misses = 0
+        self._seen = OrderedDict()  # miss counts of uncached phrases, least recently missed first
+        self._to_render = list(COMMON_PHRASES)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, text):
+        key = hashlib.sha256(f"{self.voice_id}|{self.rate}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + self.extension)
+
+    def lookup(self, text):
+        """Returns the rendered file for text, or None; a miss may queue text for rendering."""
+        path = self.path_for(text)
+        if os.path.exists(path):
+            self.hits += 1
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return path
+
+        self.misses += 1
+        seen = self._seen.pop(text, 0) + 1
+        self._seen[text] = seen
+        if len(self._seen) > self.max_tracked:
+            self._seen.popitem(last=False)
+        if seen == self.min_repeats:
+            self._to_render.append(text)
+        return None
+
+    def has_pending_renders(self):
+        return bool(self._to_render)
+
+    def render_next(self, engine):
+        """Renders one queued phrase with engine; call from the thread that owns the engine."""
+        while self._to_render:
+            text = self._to_render.pop(0)
+            path = self.path_for(text)
+            if os.path.exists(path):
+                continue
+            temp_path = path + ".tmp" + self.extension
+            try:
+                engine.save_to_file(text, temp_path)
+                engine.runAndWait()
+                if os.path.exists(temp_path) and os.path.getsize(temp_path) > 0:
+                    os.replace(temp_path, path)
+            except Exception as e:
+                print(f"TTS Cache Error: {e}")
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            self.evict()
+            return
+
+    def evict(self):
+        """Deletes least recently used files until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        while total > self.max_bytes and entries:
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def stats(self):
+        files = os.listdir(self.cache_dir)
+        size = sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in files)
+        return {"hits": self.hits, "misses": self.misses, "files": len(files), "bytes": size,
+                "pending_renders": len(self._to_render)}
+
+
+if __name__ == "__main__":
+    import pyttsx3
+
+    engine = pyttsx3.init()
+    engine.setProperty('rate', config.VOICE_RATE)
+    try:
+        engine.setProperty('voice', config.VOICE_ID)
+    except Exception:
+        print("Warning: Specific voice ID not found. Using default voice.")
+    cache = TTSCache(voice_id=engine.getProperty('voice'))
+    while cache.has_pending_renders():
+        cache.render_next(engine)
+    print(f"Pre-rendered common phrases: {cache.stats()}")
@@ -0,0 +1,106 @@
+"""Frame-level voice-activity detection and endpointing.
+
+Audio chunks from the microphone are cut into short frames and scored in one
+vectorized pass (energy and zero-crossing rate per frame). The endpointer
+closes an utterance as soon as speech has been absent for a hangover that
+grows with the length of the utterance, so "what time is it" ends after a
+couple of hundred milliseconds instead of a fixed second of silence.
+"""
+import numpy as np
+
+import config
+
+
+class VoiceActivityDetector:
+    """Classifies 16-bit PCM frames as speech or non-speech against a tracked noise floor."""
+
+    def __init__(self, sample_rate, frame_ms=config.VAD_FRAME_MS, energy_ratio=config.VAD_ENERGY_RATIO,
+                 max_zero_crossing_rate=0.35, noise_smoothing=0.95):
+        self.sample_rate = sample_rate
+        self.frame_length = max(1, int(sample_rate * frame_ms / 1000))
+        self.frame_seconds = self.frame_length / float(sample_rate)
+        self.energy_ratio = energy_ratio
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.noise_smoothing = noise_smoothing
+        self.noise_energy = None
+
+    def features(self, buffer):
+        """Returns (energy, zero_crossing_rate) arrays, one entry per complete frame in buffer."""
+        samples = np.frombuffer(buffer, dtype=np.int16)
+        usable = len(samples) - len(samples) % self.frame_length
+        if usable == 0:
+            return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+        frames = samples[:usable].astype(np.float32).reshape(-1, self.frame_length)
+        energy = np.mean(frames * frames, axis=1)
+        signs = np.signbit(frames)
+        zero_crossing_rate = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(self.frame_length - 1 or 1)
+        return energy, zero_crossing_rate
+
+    def update_noise(self, buffer):
+        """Folds a chunk of (presumed) background audio into the noise-floor estimate."""
+        energy, _ = self.features(buffer)
+        if energy.size == 0:
+            return
+        level = float(np.median(energy))
+        if self.noise_energy is None:
+            self.noise_energy = level
+        else:
+            # Cap the step so a word spoken while idle doesn't raise the floor much.
+            level = min(level, self.noise_energy * 2)
+            self.noise_energy = self.noise_energy * self.noise_smoothing + level * (1 - self.noise_smoothing)
+
+    def level(self, buffer):
+        """Median frame energy of buffer, the same measure the noise floor is kept in."""
+        energy, _ = self.features(buffer)
+        return float(np.median(energy)) if energy.size else 0.0
+
+    def speech_frames(self, buffer, floor=None):
+        """Boolean array marking the frames in buffer that contain speech.
+
+        floor replaces the noise floor as the reference level, e.g. the echo of the assistant's own voice.
+        """
+        energy, zero_crossing_rate = self.features(buffer)
+        floor = max(self.noise_energy or 0.0, floor or 0.0, 1.0)
+        loud = energy > floor * self.energy_ratio
+        # Hiss and fans are loud-ish with a very high crossing rate; very loud frames count regardless.
+        voiced = zero_crossing_rate < self.max_zero_crossing_rate
+        return loud & (voiced | (energy > floor * self.energy_ratio * 4))
+
+    def is_speech(self, buffer, min_fraction=0.3, floor=None):
+        frames = self.speech_frames(buffer, floor)
+        return frames.size > 0 and np.count_nonzero(frames) >= max(1, int(frames.size * min_fraction))
+
+
+class Endpointer:
+    """Decides when an utterance has ended, with a hangover that adapts to how long the user has spoken."""
+
+    def __init__(self, detector, min_hangover=config.VAD_MIN_HANGOVER, max_hangover=config.VAD_MAX_HANGOVER,
+                 hangover_growth=0.1):
+        self.detector = detector
+        self.min_hangover = min_hangover
+        self.max_hangover = max_hangover
+        self.hangover_growth = hangover_growth
+        self.speech_seconds = 0.0
+        self.trailing_silence = 0.0
+        self.endpoint_delay = None
+
+    @property
+    def hangover(self):
+        return min(self.max_hangover, self.min_hangover + self.hangover_growth * self.speech_seconds)
+
+    def feed(self, buffer):
+        """Processes one chunk; returns True once the utterance is over."""
+        frames = self.detector.speech_frames(buffer)
+        frame_seconds = self.detector.frame_seconds
+        speech_indexes = np.flatnonzero(frames)
+        if speech_indexes.size:
+            last = int(speech_indexes[-1])
+            self.speech_seconds += self.trailing_silence + (last + 1) * frame_seconds
+            self.trailing_silence = (frames.size - last - 1) * frame_seconds
+        else:
+            self.trailing_silence += frames.size * frame_seconds
+
+        if self.speech_seconds and self.trailing_silence >= self.hangover:
+            self.endpoint_delay = self.trailing_silence
+            return True
+        return False
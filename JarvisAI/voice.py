@@ -1,18 +1,10 @@
-import pyttsx3
 import speech_recognition as sr
 import config
-from queue import Queue, Empty
-
-engine = pyttsx3.init()
-engine.setProperty('rate', config.VOICE_RATE)
-try:
-    engine.setProperty('voice', config.VOICE_ID)
-except Exception:
-
-    print("Warning: Specific voice ID not found. Using default voice.")
-
-
-speech_queue = Queue()
+import phrases
+import audio_input
+import recognition
+import speech
+from speech import URGENT, NORMAL, LOW
 
 
 log_to_ui_callback = None
@@ -24,7 +16,7 @@ def set_ui_log_callback(callback_function):
     log_to_ui_callback = callback_function
 
 
-def say(text):
+def say(text, priority=NORMAL):
     """Converts text to speech and prints it (non-blocking)."""
 
     print(f"Assistant: {text}")
@@ -32,38 +24,60 @@ def say(text):
     if log_to_ui_callback:
         log_to_ui_callback(f"Assistant: {text}", "navy")
 
+    speech.get_service().speak(text, priority)
 
-    speech_queue.put(text)
 
+def stop_speaking():
+    """Cancels queued and playing speech; called when the user talks over the assistant."""
+    speech.get_service().cancel()
+
+
+def prepare_listening():
+    """Opens the microphone and loads the recognizer so the first command pays no start-up cost."""
+    audio_input.get_session()
+    recognition.get_backend()
 
-def listen():
-    """Listens for audio input and returns the recognized text."""
-    recognizer = sr.Recognizer()
-    with sr.Microphone() as source:
-        if log_to_ui_callback:
-            log_to_ui_callback("<font color='darkorange'><b>Listening for Command...</b></font>", "darkorange")
 
-        print("\n🎤 Listening...")
-        recognizer.pause_threshold = 1
-        recognizer.adjust_for_ambient_noise(source, duration=0.5)
-        try:
-            audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
-        except sr.WaitTimeoutError:
-            print("No speech detected.")
-            return ""
+def create_wake_word_detector():
+    """Returns a WakeWordDetector on the shared microphone, or None if the spotter can't load."""
+    import wakeword
+    try:
+        return wakeword.WakeWordDetector(audio_input.get_session())
+    except RuntimeError as e:
+        print(f"Warning: wake-word mode unavailable ({e}). Listening continuously instead.")
+        return None
+
+
+def listen(on_partial=None):
+    """Listens for audio input and returns the recognized text.
+
+    on_partial, if given, is called with partial transcripts by streaming recognizers.
+    """
+    session = audio_input.get_session()
+    stream = recognition.get_backend().start_stream(session.sample_rate, on_partial)
+    if log_to_ui_callback:
+        log_to_ui_callback("<font color='darkorange'><b>Listening for Command...</b></font>", "darkorange")
+
+    print("\n🎤 Listening...")
+    audio = session.listen(on_chunk=stream.feed, busy=speech.get_service().is_speaking, on_barge_in=stop_speaking)
+    if audio is None:
+        print("No speech detected.")
+        return ""
+    if session.last_endpoint_delay is not None:
+        print(f"Endpointed after {session.last_endpoint_delay * 1000:.0f} ms of silence.")
 
     try:
-        query = recognizer.recognize_google(audio, language='en-in')
+        query = stream.finish(audio)
         print(f"You said: {query}")
         if log_to_ui_callback:
             log_to_ui_callback(f"You said: {query}", "black")
 
         return query.lower()
     except sr.UnknownValueError:
-        say("Sorry, I didn't catch that. Please repeat.")
+        say(phrases.NOT_UNDERSTOOD, URGENT)
         return ""
     except sr.RequestError:
-        say("Speech service unavailable. Please check your internet connection.")
+        say(phrases.SPEECH_SERVICE_DOWN, URGENT)
         return ""
     except Exception as e:
         print(f"Recognition error: {e}")
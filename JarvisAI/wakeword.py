@@ -0,0 +1,74 @@
+"""Always-on wake-word spotting for hands-free activation.
+
+The microphone session's voice-activity detector gates the audio, so silence
+costs only a few vectorized numpy operations per chunk. When someone speaks,
+the chunks are fed to a Vosk recognizer restricted to a one-word grammar
+("jarvis" or unknown), which is cheap enough to leave running all day. Only
+after the wake word is heard does voice.listen() hand a command to the full
+recognizer.
+"""
+import collections
+import json
+
+import config
+from recognition import load_vosk_model
+
+
+class WakeWordDetector:
+    """Blocks until the wake word is spoken on the shared microphone session."""
+
+    def __init__(self, session, wake_word=config.WAKE_WORD, silence_reset=0.6, preroll_chunks=4):
+        self.session = session
+        self.wake_word = wake_word.lower()
+        self.silence_reset = silence_reset
+        self.preroll_chunks = preroll_chunks
+        self.vosk, self.model = load_vosk_model()
+        self.detections = 0
+
+    def _new_spotter(self):
+        grammar = json.dumps([self.wake_word, "[unk]"])
+        return self.vosk.KaldiRecognizer(self.model, self.session.sample_rate, grammar)
+
+    def _heard(self, result_json):
+        result = json.loads(result_json)
+        return self.wake_word in result.get("partial", result.get("text", "")).split()
+
+    def wait(self):
+        """Returns once the wake word has been detected."""
+        detector = self.session.detector
+        spotter = self._new_spotter()
+        recent = collections.deque(maxlen=self.preroll_chunks)
+        in_speech = False
+        silence = 0.0
+
+        chunks = self.session.chunks()
+        try:
+            for buffer in chunks:
+                if not in_speech:
+                    if not detector.is_speech(buffer):
+                        detector.update_noise(buffer)
+                        recent.append(buffer)
+                        continue
+                    in_speech = True
+                    silence = 0.0
+                    for earlier in recent:
+                        spotter.AcceptWaveform(earlier)
+                    recent.clear()
+
+                if spotter.AcceptWaveform(buffer):
+                    heard = self._heard(spotter.Result())
+                else:
+                    heard = self._heard(spotter.PartialResult())
+                if heard:
+                    self.detections += 1
+                    return
+
+                if detector.is_speech(buffer):
+                    silence = 0.0
+                else:
+                    silence += self.session.seconds_per_chunk
+                    if silence >= self.silence_reset:
+                        spotter.Reset()
+                        in_speech = False
+        finally:
+            chunks.close()